@@ -1,8 +1,15 @@
 import ffmpeg
+import functools
+import json
 import logging
+import stat
+import subprocess
+import tempfile
+import threading
 import uuid
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 
 from typing import Any, Dict, Callable
@@ -12,12 +19,43 @@ logger = logging.getLogger(__name__)
 # Action registry for robust, extensible action handling
 ACTION_REGISTRY: Dict[str, Callable] = {}
 
+# Actions that take a list of input streams rather than a single one
+_MULTI_INPUT_ACTIONS = frozenset({'concat', 'crossfade', 'audio_mix', 'overlay'})
+
 def action_handler(name):
     def decorator(func):
         ACTION_REGISTRY[name] = func
         return func
     return decorator
 
+def video_filter(func):
+    """Wrap a video-only transform so any audio stream is passed through untouched."""
+    @functools.wraps(func)
+    def wrapper(streams, params):
+        if isinstance(streams, tuple):
+            v, a = streams
+            return func(v, params), a
+        return func(streams, params)
+    return wrapper
+
+def audio_filter(func):
+    """Wrap an audio-only transform so the video stream is passed through untouched."""
+    @functools.wraps(func)
+    def wrapper(streams, params):
+        if isinstance(streams, tuple):
+            v, a = streams
+            return v, (func(a, params) if a is not None else None)
+        return func(streams.audio, params)
+    return wrapper
+
+@functools.lru_cache(maxsize=128)
+def _speed_pts(factor):
+    return f'PTS/{factor}'
+
+@functools.lru_cache(maxsize=128)
+def _rotate_rad(angle):
+    return f"{angle}*PI/180"  # convert to radians
+
 @action_handler('trim')
 def handle_trim(streams, params):
     # streams: (video, audio) or just video
@@ -30,22 +68,14 @@ def handle_trim(streams, params):
         return streams.trim(start=params['start'], duration=params['duration']).setpts('PTS-STARTPTS')
 
 @action_handler('cut')
-def handle_cut(streams, params):
-    if isinstance(streams, tuple):
-        v, a = streams
-        v_out = v.crop(params['x'], params['y'], params['width'], params['height'])
-        return v_out, a
-    else:
-        return streams.crop(params['x'], params['y'], params['width'], params['height'])
+@video_filter
+def handle_cut(v, params):
+    return v.crop(params['x'], params['y'], params['width'], params['height'])
 
 @action_handler('change_volume')
-def handle_change_volume(streams, params):
-    if isinstance(streams, tuple):
-        v, a = streams
-        a_out = a.filter('volume', params['volume']) if a is not None else None
-        return v, a_out
-    else:
-        return streams.audio.filter('volume', params['volume'])
+@audio_filter
+def handle_change_volume(a, params):
+    return a.filter('volume', params['volume'])
 
 @action_handler('concat')
 def handle_concat(streams_list, params):
@@ -67,18 +97,12 @@ def handle_concat(streams_list, params):
         return video_out, audio_out
 
 @action_handler('scale')
-def handle_scale(streams, params):
+@video_filter
+def handle_scale(v, params):
     """Scale video to specified dimensions"""
-    if isinstance(streams, tuple):
-        v, a = streams
-        width = params.get('width', -1)
-        height = params.get('height', -1)
-        v_out = v.filter('scale', w=width, h=height)
-        return v_out, a
-    else:
-        width = params.get('width', -1)
-        height = params.get('height', -1)
-        return streams.filter('scale', w=width, h=height)
+    width = params.get('width', -1)
+    height = params.get('height', -1)
+    return v.filter('scale', w=width, h=height)
 
 @action_handler('overlay')
 def handle_overlay(streams_list, params):
@@ -117,45 +141,33 @@ def handle_fade(streams, params):
         return streams.filter('fade', type=fade_type, start_time=start_time, duration=duration)
 
 @action_handler('rotate')
-def handle_rotate(streams, params):
+@video_filter
+def handle_rotate(v, params):
     """Rotate video by specified angle"""
     angle = params.get('angle', 0)  # in degrees
-    angle_rad = f"{angle}*PI/180"  # convert to radians
-    
-    if isinstance(streams, tuple):
-        v, a = streams
-        v_out = v.filter('rotate', angle=angle_rad)
-        return v_out, a
-    else:
-        return streams.filter('rotate', angle=angle_rad)
+    return v.filter('rotate', angle=_rotate_rad(angle))
 
 @action_handler('speed')
 def handle_speed(streams, params):
     """Change playback speed"""
     factor = params.get('factor', 1.0)
-    
+
     if isinstance(streams, tuple):
         v, a = streams
-        v_out = v.filter('setpts', f'PTS/{factor}')
+        v_out = v.filter('setpts', _speed_pts(factor))
         if a is not None:
             a_out = a.filter('atempo', tempo=factor)
         else:
             a_out = None
         return v_out, a_out
     else:
-        return streams.filter('setpts', f'PTS/{factor}')
+        return streams.filter('setpts', _speed_pts(factor))
 
 @action_handler('blur')
-def handle_blur(streams, params):
+@video_filter
+def handle_blur(v, params):
     """Apply blur effect"""
-    radius = params.get('radius', 5)
-    
-    if isinstance(streams, tuple):
-        v, a = streams
-        v_out = v.filter('gblur', sigma=radius)
-        return v_out, a
-    else:
-        return streams.filter('gblur', sigma=radius)
+    return v.filter('gblur', sigma=params.get('radius', 5))
 
 
 @action_handler('crossfade')
@@ -220,83 +232,148 @@ def handle_audio_mix(streams_list, params):
     return v_out, a_out
 
 @action_handler('set_fps')
-def handle_set_fps(streams, params):
+@video_filter
+def handle_set_fps(v, params):
     """Set video frame rate"""
-    fps = params.get('fps', 30)
-    
-    if isinstance(streams, tuple):
-        v, a = streams
-        v_out = v.filter('fps', fps=fps)
-        return v_out, a
-    else:
-        return streams.filter('fps', fps=fps)
+    return v.filter('fps', fps=params.get('fps', 30))
 
 @action_handler('set_format')
-def handle_set_format(streams, params):
+@video_filter
+def handle_set_format(v, params):
     """Set video pixel format"""
-    format_type = params.get('format', 'yuv420p')
-    
-    if isinstance(streams, tuple):
-        v, a = streams
-        v_out = v.filter('format', format_type)
-        return v_out, a
-    else:
-        return streams.filter('format', format_type)
+    return v.filter('format', params.get('format', 'yuv420p'))
 
 @action_handler('reset_video_pts')
-def handle_reset_video_pts(streams, params):
+@video_filter
+def handle_reset_video_pts(v, params):
     """Reset video presentation timestamp"""
-    if isinstance(streams, tuple):
-        v, a = streams
-        v_out = v.filter('setpts', 'PTS-STARTPTS')
-        return v_out, a
-    else:
-        return streams.filter('setpts', 'PTS-STARTPTS')
+    return v.filter('setpts', 'PTS-STARTPTS')
 
 @action_handler('audio_resample')
-def handle_audio_resample(streams, params):
+@audio_filter
+def handle_audio_resample(a, params):
     """Resample audio to specified sample rate"""
-    sample_rate = params.get('sample_rate', 44100)
-    
-    if isinstance(streams, tuple):
-        v, a = streams
-        if a is not None:
-            a_out = a.filter('aresample', sample_rate)
-        else:
-            a_out = None
-        return v, a_out
-    else:
-        return streams.audio.filter('aresample', sample_rate)
+    return a.filter('aresample', params.get('sample_rate', 44100))
 
 @action_handler('reset_audio_pts')
-def handle_reset_audio_pts(streams, params):
+@audio_filter
+def handle_reset_audio_pts(a, params):
     """Reset audio presentation timestamp"""
-    if isinstance(streams, tuple):
-        v, a = streams
-        if a is not None:
-            a_out = a.filter('asetpts', 'PTS-STARTPTS')
-        else:
-            a_out = None
-        return v, a_out
-    else:
-        return streams.audio.filter('asetpts', 'PTS-STARTPTS')
+    return a.filter('asetpts', 'PTS-STARTPTS')
 
 @action_handler('audio_dynaudnorm')
-def handle_audio_dynaudnorm(streams, params):
+@audio_filter
+def handle_audio_dynaudnorm(a, params):
     """Apply dynamic audio normalization"""
-    if isinstance(streams, tuple):
-        v, a = streams
-        if a is not None:
-            a_out = a.filter('dynaudnorm')
-        else:
-            a_out = None
-        return v, a_out
-    else:
-        return streams.audio.filter('dynaudnorm')
+    return a.filter('dynaudnorm')
+
+
+# Containers that can be demuxed from a pipe (no seeking back for a trailing
+# index like mp4's moov atom), keyed by file extension
+_STREAMABLE_FORMATS = {'.ts': 'mpegts', '.mkv': 'matroska', '.webm': 'matroska', '.flv': 'flv'}
+
+# Preferred hardware H.264 encoders, in order
+_HW_ENCODERS = ('h264_videotoolbox', 'h264_nvenc', 'h264_qsv', 'h264_vaapi')
+
+# Decode-side hwaccel methods, matched against `ffmpeg -hwaccels` output
+_HW_ACCELS = ('videotoolbox', 'cuda', 'qsv', 'vaapi')
+
+
+@functools.lru_cache(maxsize=None)
+def _detect_hw_encoder(ffmpeg_cmd):
+    """Probe the ffmpeg build once and return the first available hardware H.264 encoder, or None."""
+    try:
+        result = subprocess.run([ffmpeg_cmd, '-hide_banner', '-encoders'],
+                                capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning(f"Hardware encoder probe failed: {e}")
+        return None
+    for name in _HW_ENCODERS:
+        if name in result.stdout:
+            logger.info(f"Detected hardware encoder: {name}")
+            return name
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _detect_hw_accel(ffmpeg_cmd):
+    """Probe `ffmpeg -hwaccels` once and return the first supported decode method, or None."""
+    try:
+        result = subprocess.run([ffmpeg_cmd, '-hide_banner', '-hwaccels'],
+                                capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning(f"Hardware accel probe failed: {e}")
+        return None
+    available = result.stdout.split()
+    for name in _HW_ACCELS:
+        if name in available:
+            logger.info(f"Detected hardware decode method: {name}")
+            return name
+    return None
+
+
+def _probe_cache_token(source):
+    """Cache token for a probe: (mtime, size) for local files so edits invalidate, None for URLs.
+
+    Size catches same-mtime overwrites that coarse filesystem timestamps
+    would otherwise let alias to a stale probe.
+    """
+    try:
+        st = os.stat(source)
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return None
+
+
+@functools.lru_cache(maxsize=256)
+def _probe_cached(source, token):
+    """ffprobe a source, memoized on (source, token) to skip repeat subprocess spawns."""
+    return ffmpeg.probe(source)
+
 
+# A trim start must land this close to a keyframe for stream copy to cut
+# accurately; anything further off falls back to a re-encode
+_TRIM_COPY_TOLERANCE = 0.1
 
+
+def _keyframe_at_or_before(path, start):
+    """Return the last video keyframe timestamp at or before `start`, or None.
+
+    Probes only a short interval ending at `start` rather than every frame.
+    Returns None when ffprobe is unavailable or finds no keyframe in the
+    window - callers treat that as "no fast path".
+    """
+    try:
+        probe = ffmpeg.probe(
+            path, select_streams='v:0',
+            show_entries='frame=pts_time,key_frame',
+            read_intervals=f'{max(0.0, start - _TRIM_COPY_TOLERANCE)}%{start + 0.001}')
+    except (ffmpeg.Error, OSError) as e:
+        logger.info(f"Keyframe probe unavailable for {path}: {e}")
+        return None
+    best = None
+    for frame in probe.get('frames', ()):
+        if frame.get('key_frame') == 1 and frame.get('pts_time') is not None:
+            t = float(frame['pts_time'])
+            if t <= start + 1e-3 and (best is None or t > best):
+                best = t
+    return best
+
+
+_FILE_HANDLER = None
+
+def _file_handler():
+    """Return a module-level FileHandler singleton (lazy import avoids circular imports)."""
+    global _FILE_HANDLER
+    if _FILE_HANDLER is None:
+        from files_util.file_handler import FileHandler
+        _FILE_HANDLER = FileHandler()
+    return _FILE_HANDLER
+
+
+@functools.lru_cache(maxsize=1)
 def _find_ffmpeg_cmd():
-    """Find the best available ffmpeg command."""
+    """Find the best available ffmpeg command (resolved once per process)."""
     # Try common locations in order of preference
     candidates = [
         '/opt/homebrew/bin/ffmpeg',  # Homebrew on Apple Silicon
@@ -317,39 +394,90 @@ def _find_ffmpeg_cmd():
     # Fallback to system PATH
     return 'ffmpeg'
 
+
+def _is_readable_input(path):
+    """Regular files and named pipes both count as local ffmpeg inputs."""
+    try:
+        mode = os.stat(path).st_mode
+    except OSError:
+        return False
+    return stat.S_ISREG(mode) or stat.S_ISFIFO(mode)
+
+
+def _node_key(n, key_cache):
+    """Canonical JSON key for a workflow subtree, memoized by node identity.
+
+    Two subtrees with the same action, params and children serialize to the
+    same key, which is what the render pass uses to build them only once.
+    """
+    key = key_cache.get(id(n))
+    if key is None:
+        key = json.dumps(n, sort_keys=True, default=repr)
+        key_cache[id(n)] = key
+    return key
+
+
 class FFmpeg:
     def __init__(self):
         self.ffmpeg_cmd = _find_ffmpeg_cmd()
-        self._file_copies = {}  # Maps original_path -> [copy1_path, copy2_path, ...]
-        self._copy_usage_index = {}  # Maps original_path -> next_index_to_use
+        self._url_cache: Dict[str, str] = {}  # Maps source URL -> local path
+        self._url_cache_lock = threading.Lock()
+        self._normalized_cache: Dict[str, tuple] = {}  # Maps local path -> normalized (video, audio)
+        self._hw_decode = False  # Set per-render when hw_accel is requested
+        self._pre_normalized = frozenset()  # Inputs already rendered through _normalize_streams
+        self._cancel_event = threading.Event()
         logger.info(f"Initializing FFmpeg handler with command: {self.ffmpeg_cmd}")
 
+    # Hardware probes run subprocesses; defer them until a render actually
+    # opts into hw_accel (the probe results are lru-cached module-wide, so
+    # only the first access per process pays)
+
+    @functools.cached_property
+    def hw_encoder(self):
+        return _detect_hw_encoder(self.ffmpeg_cmd)
+
+    @functools.cached_property
+    def hw_accel_method(self):
+        return _detect_hw_accel(self.ffmpeg_cmd)
+
     def get_media_info(self, input_source: str) -> dict:
         logger.info(f"Probing media info for: {input_source}")
         try:
-            probe = ffmpeg.probe(input_source)
+            probe = _probe_cached(input_source, _probe_cache_token(input_source))
             logger.info(f"Media info probe successful for: {input_source}")
             return {"stdout": probe, "stderr": "", "returncode": 0}
         except ffmpeg.Error as e:
             logger.error(f"Media info probe failed for {input_source}: {e}")
             return {"stdout": "", "stderr": str(e), "returncode": 1}
 
+    def get_media_info_batch(self, sources) -> Dict[str, dict]:
+        """Probe several sources concurrently, amortizing the per-probe subprocess cost.
+
+        Returns a dict mapping each source to its get_media_info result.
+        """
+        sources = list(sources)
+        if not sources:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(8, len(sources))) as executor:
+            return dict(zip(sources, executor.map(self.get_media_info, sources)))
+
     def _download_source_if_needed(self, source: str) -> str:
         """Download URL to local file if it's a remote URL, otherwise return path as-is."""
+        with self._url_cache_lock:
+            if source in self._url_cache:
+                return self._url_cache[source]
         parsed = urlparse(source)
         if parsed.scheme in ("http", "https"):
-            # Import here to avoid circular imports
-            from files_util.file_handler import FileHandler
-            file_handler = FileHandler()
-            local_path = file_handler.download_url_to_local(source)
+            local_path = _file_handler().download_url_to_local(source)
             if not local_path:
                 raise ValueError(f"Failed to download URL: {source}")
             logger.info(f"Downloaded {source} to {local_path}")
-            return local_path
-        elif os.path.isfile(source):
-            return source
+        elif _is_readable_input(source):
+            local_path = source
         else:
             raise ValueError(f"Invalid URL or file path: {source}")
+        with self._url_cache_lock:
+            return self._url_cache.setdefault(source, local_path)
         
     def normalize_input(self, local_path):
         """
@@ -361,148 +489,498 @@ class FFmpeg:
         Returns:
             tuple: (video_stream, audio_stream) - normalized ffmpeg streams
         """
+        if local_path in self._normalized_cache:
+            return self._normalized_cache[local_path]
         try:
-            # Get input
-            inp = ffmpeg.input(local_path)
-            streams = (inp.video, inp.audio)
-            
-            # Apply video normalization actions
-            streams = ACTION_REGISTRY['set_format'](streams, {'format': 'yuv420p'})
-            streams = ACTION_REGISTRY['reset_video_pts'](streams, {})
-            streams = ACTION_REGISTRY['set_fps'](streams, {'fps': 30})
-
-            # Apply audio normalization actions
-            streams = ACTION_REGISTRY['audio_resample'](streams, {'sample_rate': 44100})
-            streams = ACTION_REGISTRY['reset_audio_pts'](streams, {})
-            streams = ACTION_REGISTRY['audio_dynaudnorm'](streams, {})
-            
+            input_kwargs = {}
+            if self._hw_decode:
+                # Hardware decode only: without hwaccel_output_format the
+                # decoded frames land in system memory, so the software
+                # filtergraph keeps working unchanged
+                input_kwargs['hwaccel'] = self.hw_accel_method
+            inp = ffmpeg.input(local_path, **input_kwargs)
+            if local_path in self._pre_normalized:
+                # Intermediate produced by a branch render that already ran the
+                # normalization chain; running it again would apply dynaudnorm
+                # twice, so only reset the timestamps for concatenation
+                streams = (inp.video.filter('setpts', 'PTS-STARTPTS'),
+                           inp.audio.filter('asetpts', 'PTS-STARTPTS'))
+            else:
+                streams = self._normalize_streams(inp)
+            self._normalized_cache[local_path] = streams
             return streams
-            
+
         except Exception as e:
             raise Exception(f"Error normalizing input {local_path}: {str(e)}")
 
-    def _scan_workflow_for_file_usage(self, node):
-        """Scan workflow to count how many times each file is used."""
-        file_usage = {}
-        
-        def scan_node(n):
-            if isinstance(n, dict):
-                if "url" in n:
-                    # Found a file reference - convert to local path
-                    source = n["url"]
-                    local_path = self._download_source_if_needed(source)
-                    file_usage[local_path] = file_usage.get(local_path, 0) + 1
-                elif "action" in n:
-                    # Recursively scan action inputs
-                    input_data = n.get('input')
-                    if isinstance(input_data, list):
-                        # Multi-input action
-                        for inp in input_data:
-                            scan_node(inp)
-                    elif input_data is not None:
-                        # Single input action
-                        scan_node(input_data)
+    def _normalize_streams(self, inp):
+        """Chain the normalization filters directly on an ffmpeg input node - same
+        graph as the former per-action registry dispatches, without six dispatch calls."""
+        v = (inp.video
+             .filter('format', 'yuv420p')
+             .filter('setpts', 'PTS-STARTPTS')
+             .filter('fps', fps=30))
+        a = (inp.audio
+             .filter('aresample', 44100)
+             .filter('asetpts', 'PTS-STARTPTS')
+             .filter('dynaudnorm'))
+        return v, a
+
+    def _preprocess(self, node):
+        """Flatten the workflow into a post-order plan with a single walk.
+
+        One traversal replaces the former scan-then-build pair: it collects the
+        leaf sources (in visit order), counts repeated action subtrees by their
+        canonical-JSON key, and emits flat plan records the build loop can
+        consume with a value stack - no second walk over the dict tree. Records
+        are plain tuples to keep per-node overhead minimal:
+
+            ('leaf', source)
+            ('action', handler, node, n_children, is_multi, key)
+            ('ref', key)   # repeat of an already-planned subtree
+
+        A repeated subtree is only descended once; the duplicates become 'ref'
+        records served from a split fan-out at build time, so their leaves must
+        not inflate the source list.
+        """
+        plan = []
+        sources = []
+        subtree_refs = {}
+        key_cache = {}
+        # Bound as locals so the per-node dispatch skips global lookups
+        registry = ACTION_REGISTRY
+        multi_input = _MULTI_INPUT_ACTIONS
+        stack = [(node, False)]
+        while stack:
+            n, visited = stack.pop()
+            if isinstance(n, dict) and "action" in n:
+                action = n['action']
+                key = _node_key(n, key_cache)
+                is_multi = action in multi_input
+                children = n.get('input', []) if is_multi else [n['input']]
+                if not visited:
+                    if key in subtree_refs:
+                        subtree_refs[key] += 1
+                        plan.append(('ref', key))
+                        continue
+                    subtree_refs[key] = 1
+                    if action not in registry:
+                        raise ValueError(f"Unknown action: {action}")
+                    stack.append((n, True))
+                    # Reversed so children complete left-to-right on the value stack
+                    for child in reversed(children):
+                        stack.append((child, False))
+                else:
+                    plan.append(('action', registry[action], n, len(children), is_multi, key))
+            elif isinstance(n, dict) and "url" in n:
+                sources.append(n["url"])
+                plan.append(('leaf', n["url"]))
             elif isinstance(n, str):
-                # Legacy string input
-                local_path = self._download_source_if_needed(n)
-                file_usage[local_path] = file_usage.get(local_path, 0) + 1
-        
-        scan_node(node)
+                # Legacy support for string inputs (should not happen with new architecture)
+                sources.append(n)
+                plan.append(('leaf', n))
+            else:
+                raise ValueError(f"Invalid node format: {n}")
+        return plan, sources, subtree_refs
+
+    def _resolve_file_usage(self, sources):
+        """Resolve every source to a local path and count leaf references per path."""
+        unique_sources = list(dict.fromkeys(sources))
+        if unique_sources:
+            # Resolve/download all sources concurrently; this warms _url_cache so the
+            # usage count below (and the later stream build) are pure dict lookups.
+            with ThreadPoolExecutor(max_workers=min(8, len(unique_sources))) as executor:
+                list(executor.map(self._download_source_if_needed, unique_sources))
+
+        file_usage = {}
+        for source in sources:
+            local_path = self._download_source_if_needed(source)
+            file_usage[local_path] = file_usage.get(local_path, 0) + 1
         return file_usage
 
-    def _create_file_copies(self, file_usage):
-        """Create hard copies for files that are used multiple times."""
-        self._file_copies.clear()
-        self._copy_usage_index.clear()
-        
+    @staticmethod
+    def _fan_out(streams, count):
+        """Wrap a (video, audio) pair in split/asplit so `count` consumers share one build.
+
+        Returns a mutable entry [video_split, audio_split, next_index]; each
+        consumer draws the next output via _next_ref.
+        """
+        v, a = streams
+        v_split = v.filter_multi_output('split', count)
+        a_split = a.filter_multi_output('asplit', count) if a is not None else None
+        return [v_split, a_split, 0]
+
+    @staticmethod
+    def _next_ref(entry):
+        """Draw the next (video, audio) output pair from a fan-out entry."""
+        v_split, a_split, index = entry
+        entry[2] = index + 1
+        return v_split.stream(index), (a_split.stream(index) if a_split is not None else None)
+
+    def _build_split_streams(self, file_usage):
+        """For files used more than once, decode+normalize once and fan out via split/asplit.
+
+        Each leaf visit draws the next split output, so the file is decoded a
+        single time regardless of how many branches reference it.
+        """
+        split_streams = {}
         for file_path, usage_count in file_usage.items():
             if usage_count > 1:
-                logger.info(f"Creating {usage_count-1} copies for {file_path} (used {usage_count} times)")
-                
-                # Create copies (usage_count - 1 copies, since original counts as one)
-                copies = []
-                for i in range(usage_count - 1):
-                    copy_path = os.path.realpath(f"/tmp/copy_{i}_{uuid.uuid4()}_{os.path.basename(file_path)}")
-                    shutil.copy2(file_path, copy_path)
-                    copies.append(copy_path)
-                    logger.info(f"Created copy: {copy_path}")
-                
-                self._file_copies[file_path] = copies
-                self._copy_usage_index[file_path] = 0
-
-    def _get_unique_file_path(self, original_path):
-        """Get a unique file path for each usage - original for first use, copies for subsequent uses."""
-        if original_path not in self._file_copies:
-            # File is only used once, return original
-            return original_path
-        
-        # File is used multiple times
-        usage_index = self._copy_usage_index[original_path]
-        
-        if usage_index == 0:
-            # First usage - use original file
-            self._copy_usage_index[original_path] += 1
-            return original_path
+                logger.info(f"Splitting {file_path} into {usage_count} stream refs (used {usage_count} times)")
+                split_streams[file_path] = self._fan_out(self.normalize_input(file_path), usage_count)
+        return split_streams
+
+    def _threaded_cmd(self):
+        """ffmpeg invocation with multithreading flags in global position.
+
+        ffmpeg defaults filter-graph threading to 1; -threads 0 lets the codecs
+        pick, while filter_threads/filter_complex_threads parallelize the filters.
+        Passed as the command list so the flags precede the inputs - appended
+        global_args end up after the output file, where ffmpeg ignores them.
+        """
+        cpu_count = str(os.cpu_count() or 1)
+        return [self.ffmpeg_cmd,
+                '-threads', '0',
+                '-filter_threads', cpu_count,
+                '-filter_complex_threads', cpu_count]
+
+    def cancel(self):
+        """Request cancellation of the render currently in flight (if any)."""
+        self._cancel_event.set()
+
+    def _run_graph(self, out):
+        """Run a compiled graph via run_async, polling so an in-flight render can be cancelled.
+
+        Unlike blocking ffmpeg.run, this lets cancel() stop the subprocess instead of
+        leaving it burning CPU after the caller has given up on the result.
+        """
+        self._cancel_event.clear()
+        proc = ffmpeg.run_async(out, cmd=self._threaded_cmd(), pipe_stderr=True, overwrite_output=True)
+        stderr_chunks = []
+        while proc.poll() is None:
+            if self._cancel_event.is_set():
+                logger.info("Cancelling in-flight render")
+                proc.terminate()
+                proc.wait()
+                raise RuntimeError("Render cancelled")
+            line = proc.stderr.readline()
+            if line:
+                stderr_chunks.append(line)
+        remainder = proc.stderr.read()
+        if remainder:
+            stderr_chunks.append(remainder)
+        if proc.returncode != 0:
+            raise ffmpeg.Error('ffmpeg', None, b''.join(stderr_chunks))
+
+    def _stdin_streamable_format(self, sources):
+        """Return the pipe demux format when the workflow has exactly one remote source
+        in a pipe-safe container, else None."""
+        if len(sources) != 1:
+            return None
+        source = sources[0]
+        if source in self._url_cache or urlparse(source).scheme not in ("http", "https"):
+            return None
+        ext = os.path.splitext(urlparse(source).path)[1].lower()
+        return _STREAMABLE_FORMATS.get(ext)
+
+    def _run_with_stdin_source(self, out, url):
+        """Run a graph reading from stdin, streaming the URL body straight into ffmpeg.
+
+        Skips the download->disk->re-read hop: the bytes go from the socket into
+        the demuxer without ever touching local storage.
+        """
+        logger.info(f"Streaming {url} directly into ffmpeg stdin")
+        proc = ffmpeg.run_async(out, cmd=self._threaded_cmd(), pipe_stdin=True,
+                                pipe_stderr=True, overwrite_output=True)
+        # Drain stderr concurrently so ffmpeg's progress output can't fill the
+        # pipe and stall the demuxer while we are still feeding stdin
+        stderr_chunks = []
+        drain = threading.Thread(target=lambda: stderr_chunks.append(proc.stderr.read()))
+        drain.start()
+        try:
+            r = _file_handler().open_url_stream(url)
+            r.raw.decode_content = True
+            shutil.copyfileobj(r.raw, proc.stdin, length=1024 * 1024)
+            proc.stdin.close()
+        except (BrokenPipeError, OSError):
+            # ffmpeg rejected the stream and exited; surface its diagnostics
+            # instead of a bare broken-pipe error so callers (and the
+            # hardware-fallback retry) see an ffmpeg.Error like every other path
+            try:
+                proc.stdin.close()
+            except OSError:
+                pass
+        returncode = proc.wait()
+        drain.join()
+        if returncode != 0:
+            raise ffmpeg.Error('ffmpeg', None, b''.join(stderr_chunks))
+
+    def _compile_graph(self, node, render_path, output_kwargs, allow_pipe=True):
+        """Compile a workflow into an ffmpeg output node writing to render_path.
+
+        Returns (out, pipe_format, sources); pipe_format is the stdin demux
+        format when the single-remote-source streaming path applies (and is
+        allowed), else None.
+        """
+        # Scan workflow and fan out duplicated files through split filters
+        self._normalized_cache.clear()  # Stream nodes are only valid within a single graph
+        plan, sources, subtree_refs = self._preprocess(node)
+        pipe_format = self._stdin_streamable_format(sources) if allow_pipe else None
+        if pipe_format is None:
+            file_usage = self._resolve_file_usage(sources)
+            logger.info(f"File usage analysis: {file_usage}")
+            split_streams = self._build_split_streams(file_usage)
         else:
-            # Subsequent usage - use a copy
-            copy_index = usage_index - 1
-            copies = self._file_copies[original_path]
-            if copy_index < len(copies):
-                self._copy_usage_index[original_path] += 1
-                return copies[copy_index]
-            else:
-                raise RuntimeError(f"No more copies available for {original_path}")
-
-    def render_workflow(self, node) -> str:
-        # Step 1 & 2: Scan workflow and create copies for duplicated files
-        file_usage = self._scan_workflow_for_file_usage(node)
-        logger.info(f"File usage analysis: {file_usage}")
-        self._create_file_copies(file_usage)
-        def build_stream(n):
-            # Handle leaf nodes with media sources (URLs or file paths)
-            if isinstance(n, dict) and "url" in n:
-                source = n["url"]
-                original_path = self._download_source_if_needed(source)
-                unique_path = self._get_unique_file_path(original_path)
-                return self.normalize_input(unique_path)
-            
-            # Handle action nodes
-            if isinstance(n, dict) and "action" in n:
-                action = n['action']
-                if action in ['concat', 'crossfade', 'audio_mix', 'overlay']:
-                    # Handle actions with list of inputs
-                    inputs = n.get('input', [])
-                    streams_list = [build_stream(inp) for inp in inputs]
-                    return ACTION_REGISTRY[action](streams_list, n)
+            # Single remote streamable source: feed it through stdin, no download
+            split_streams = {}
+        # Repeated action subtrees get built once and fanned out from here
+        subgraph_splits = {}
+
+        def leaf_stream(source):
+            if pipe_format is not None:
+                # Network-fed pipe: the container format is already known, so
+                # skip the deep stream-analysis buffering that otherwise delays
+                # the first decoded frame by seconds on remote sources
+                return self._normalize_streams(
+                    ffmpeg.input('pipe:', format=pipe_format, fflags='nobuffer',
+                                 probesize='32768', analyzeduration='0'))
+            local_path = self._download_source_if_needed(source)
+            entry = split_streams.get(local_path)
+            if entry is None:
+                # File used once - no fan-out needed
+                return self.normalize_input(local_path)
+            return self._next_ref(entry)
+
+        def build_stream(plan_records):
+            # Consume the flattened post-order plan with a value stack: leaves
+            # push their streams, action records pop their children's streams
+            # and push the handler result. The dict tree is never walked again.
+            values = []
+            for record in plan_records:
+                kind = record[0]
+                if kind == 'leaf':
+                    values.append(leaf_stream(record[1]))
+                elif kind == 'ref':
+                    # Repeat of an already-built subtree - draw from its fan-out
+                    values.append(self._next_ref(subgraph_splits[record[1]]))
                 else:
-                    handler = ACTION_REGISTRY.get(action)
-                    if not handler:
-                        raise ValueError(f"Unknown action: {action}")
-                    input_stream = build_stream(n['input'])
-                    return handler(input_stream, n)
-            
-            # Legacy support for string inputs (should not happen with new architecture)
-            if isinstance(n, str):
-                original_path = self._download_source_if_needed(n)
-                unique_path = self._get_unique_file_path(original_path)
-                return self.normalize_input(unique_path)
-            
-            raise ValueError(f"Invalid node format: {n}")
-            
-        streams = build_stream(node)
-        output_path = os.path.realpath(f"/tmp/final_{uuid.uuid4()}.mp4")
+                    _, handler, n, n_children, is_multi, key = record
+                    child_streams = values[len(values) - n_children:]
+                    del values[len(values) - n_children:]
+                    if is_multi:
+                        result = handler(child_streams, n)
+                    else:
+                        result = handler(child_streams[0], n)
+                    refs = subtree_refs[key]
+                    if refs > 1 and isinstance(result, tuple):
+                        logger.info(f"Sharing duplicated '{n['action']}' subtree across {refs} refs")
+                        entry = self._fan_out(result, refs)
+                        subgraph_splits[key] = entry
+                        result = self._next_ref(entry)
+                    values.append(result)
+            return values[0]
+
+        streams = build_stream(plan)
         if isinstance(streams, tuple):
             v, a = streams
             if a is not None:
-                out = ffmpeg.output(v, a, output_path)
+                out = ffmpeg.output(v, a, render_path, **output_kwargs)
+            else:
+                out = ffmpeg.output(v, render_path, **output_kwargs)
+        else:
+            out = ffmpeg.output(streams, render_path, **output_kwargs)
+        return out, pipe_format, sources
+
+    def start_render(self, node, output_path: str, **output_kwargs):
+        """Compile a workflow graph and launch ffmpeg in the background.
+
+        Returns the running Popen handle; the caller owns waiting and cleanup.
+        Meant for streaming consumers (named pipes, segment playlists) that
+        read the output while ffmpeg is still producing it, so there is no
+        atomic-rename staging here.
+        """
+        out, _, _ = self._compile_graph(node, output_path, output_kwargs, allow_pipe=False)
+        return ffmpeg.run_async(out, cmd=self._threaded_cmd(), overwrite_output=True)
+
+    def _try_trim_copy(self, node, render_path) -> bool:
+        """Render a keyframe-aligned single-trim workflow with -c copy.
+
+        A workflow that is exactly one trim of one file, whose start sits on
+        (or within tolerance of) a video keyframe, needs no decode or encode:
+        demux from the keyframe and remux `duration` seconds. Returns False
+        whenever the fast path doesn't apply or fails, leaving the normal
+        re-encode render to handle the node.
+        """
+        if not isinstance(node, dict) or node.get('action') != 'trim':
+            return False
+        inp = node.get('input')
+        source = inp.get('url') if isinstance(inp, dict) else inp if isinstance(inp, str) else None
+        if source is None:
+            return False
+        try:
+            local_path = self._download_source_if_needed(source)
+            start = float(node['start'])
+            duration = float(node['duration'])
+        except (ValueError, TypeError, KeyError):
+            return False
+        if not os.path.isfile(local_path):  # Pipes can't be seeked for -ss
+            return False
+        keyframe = _keyframe_at_or_before(local_path, start)
+        if keyframe is None or start - keyframe > _TRIM_COPY_TOLERANCE:
+            return False
+        logger.info(f"Stream-copying trim of {local_path} from keyframe {keyframe}")
+        out = ffmpeg.input(local_path, ss=keyframe).output(render_path, t=duration, c='copy')
+        try:
+            self._run_graph(out)
+        except ffmpeg.Error as e:
+            # e.g. codec/container mismatch on remux - re-encode instead
+            logger.info(f"Stream-copy trim failed, falling back to re-encode: {e}")
+            return False
+        return True
+
+    @staticmethod
+    def _stream_copy_signature(local_path):
+        """Codec/geometry/rate tuple for concat compatibility, or None if unprobeable."""
+        try:
+            probe = _probe_cached(local_path, _probe_cache_token(local_path))
+        except (ffmpeg.Error, OSError) as e:
+            logger.info(f"Probe unavailable for {local_path}: {e}")
+            return None
+        signature = []
+        for stream in probe.get('streams', ()):
+            if stream.get('codec_type') == 'video':
+                signature.append(('v', stream.get('codec_name'), stream.get('width'),
+                                  stream.get('height'), stream.get('r_frame_rate'),
+                                  stream.get('pix_fmt')))
+            elif stream.get('codec_type') == 'audio':
+                signature.append(('a', stream.get('codec_name'),
+                                  stream.get('sample_rate'), stream.get('channels')))
+        return tuple(signature) or None
+
+    def _try_concat_copy(self, node, render_path) -> bool:
+        """Render an all-leaf concat of parameter-identical files with -c copy.
+
+        When every concat input is a plain file and they agree on codec,
+        geometry and rates, the concat demuxer can splice them without
+        decoding; anything unprobeable or mismatched (or a failed remux)
+        returns False and the filter-based concat re-encodes as usual.
+        """
+        if not isinstance(node, dict) or node.get('action') != 'concat':
+            return False
+        children = node.get('input')
+        if not isinstance(children, list) or len(children) < 2:
+            return False
+        local_paths = []
+        for child in children:
+            source = (child.get('url') if isinstance(child, dict) and set(child) == {'url'}
+                      else child if isinstance(child, str) else None)
+            if source is None:
+                return False
+            try:
+                local_path = self._download_source_if_needed(source)
+            except ValueError:
+                return False
+            if not os.path.isfile(local_path):
+                return False
+            local_paths.append(local_path)
+        signatures = {self._stream_copy_signature(p) for p in local_paths}
+        if len(signatures) != 1 or None in signatures:
+            return False
+        logger.info(f"Stream-copying concat of {len(local_paths)} parameter-identical inputs")
+        fd, list_path = tempfile.mkstemp(suffix='.txt')
+        try:
+            with os.fdopen(fd, 'w') as listing:
+                for local_path in local_paths:
+                    escaped = local_path.replace("'", "'\\''")
+                    listing.write(f"file '{escaped}'\n")
+            out = ffmpeg.input(list_path, f='concat', safe=0).output(render_path, c='copy')
+            try:
+                self._run_graph(out)
+            except ffmpeg.Error as e:
+                logger.info(f"Stream-copy concat failed, falling back to re-encode: {e}")
+                return False
+            return True
+        finally:
+            os.remove(list_path)
+
+    def render_workflow(self, node, hw_accel: bool = False, output_path: str = None,
+                        preset: str = 'ultrafast', verify_only: bool = False,
+                        pre_normalized=()) -> str:
+        if verify_only:
+            # Decode and run the full filtergraph but discard the result via
+            # the null muxer - proves the workflow renders without paying for
+            # an encode. Returns no path because no file is produced.
+            out, pipe_format, sources = self._compile_graph(node, 'pipe:', {'format': 'null'})
+            if pipe_format is not None:
+                self._run_with_stdin_source(out, sources[0])
             else:
-                out = ffmpeg.output(v, output_path)
+                self._run_graph(out)
+            logger.info("Verify-only render successful")
+            return None
+        if output_path is not None:
+            # Render next to the destination (same filesystem) and publish with an
+            # atomic rename, so the caller never observes a half-written file and
+            # no cross-filesystem copy is needed afterwards
+            output_path = os.path.abspath(output_path)
+            directory, filename = os.path.split(output_path)
+            base, ext = os.path.splitext(filename)
+            render_path = os.path.join(directory, f".{base}.{uuid.uuid4().hex}.part{ext}")
+        else:
+            output_path = os.path.realpath(f"/tmp/final_{uuid.uuid4()}.mp4")
+            render_path = output_path
+        # Keyframe-aligned single-trim and parameter-identical concat
+        # workflows skip the filtergraph entirely
+        if self._try_trim_copy(node, render_path) or self._try_concat_copy(node, render_path):
+            if render_path != output_path:
+                os.replace(render_path, output_path)
+            logger.info(f"Render successful (stream copy): {output_path}")
+            return output_path
+
+        output_kwargs = {}
+        if hw_accel and self.hw_encoder:
+            # Offload the encode to fixed-function hardware when the caller opts in
+            output_kwargs['vcodec'] = self.hw_encoder
         else:
-            out = ffmpeg.output(streams, output_path)
+            # Results here feed an interactive session, so bias the x264
+            # defaults toward time-to-result; callers producing a final
+            # deliverable can pass preset='slow'
+            output_kwargs.update(preset=preset, tune='zerolatency', crf=28)
+            if os.path.splitext(render_path)[1].lower() in ('.mp4', '.mov'):
+                # Moov atom up front so players can start before the download ends
+                output_kwargs['movflags'] = '+faststart'
+        self._hw_decode = bool(hw_accel and self.hw_accel_method)
+        self._pre_normalized = frozenset(pre_normalized)
+
+        def compile_and_run():
+            out, pipe_format, sources = self._compile_graph(node, render_path, output_kwargs)
+            if pipe_format is not None:
+                self._run_with_stdin_source(out, sources[0])
+            else:
+                self._run_graph(out)
+
         try:
-            ffmpeg.run(out, overwrite_output=True, cmd=self.ffmpeg_cmd)
+            try:
+                compile_and_run()
+            except ffmpeg.Error as e:
+                if not (self._hw_decode or 'vcodec' in output_kwargs):
+                    logger.error(f"Render failed: {e}")
+                    raise
+                # Hardware paths can fail at runtime (driver/codec limits the
+                # probe can't see); retry the same graph in pure software
+                logger.warning(f"Hardware-accelerated render failed, retrying in software: {e}")
+                self._hw_decode = False
+                output_kwargs.pop('vcodec', None)
+                output_kwargs.setdefault('preset', preset)
+                output_kwargs.setdefault('tune', 'zerolatency')
+                output_kwargs.setdefault('crf', 28)
+                compile_and_run()
+            if render_path != output_path:
+                os.replace(render_path, output_path)
             logger.info(f"Render successful: {output_path}")
             return output_path
         except ffmpeg.Error as e:
             logger.error(f"Render failed: {e}")
-            raise
\ No newline at end of file
+            raise
+        finally:
+            self._hw_decode = False
+            self._pre_normalized = frozenset()
\ No newline at end of file
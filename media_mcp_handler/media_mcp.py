@@ -1,17 +1,78 @@
-from ffmpeg_utils.ffmpeg_handler import FFmpeg
+from ffmpeg_utils.ffmpeg_handler import FFmpeg, ACTION_REGISTRY
 from files_util.file_handler import FileHandler
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter, Retry
 from urllib.parse import urlparse
 from typing import Optional, Dict, List, Any, Union
 import requests
+import functools
 import logging
+import threading
+import re
+import shutil
+import tempfile
+import time
 import uuid
 import os
 import base64
+import binascii
+import hashlib
 import json
 from .workflow_builder import WorkflowBuilder
 
 logger = logging.getLogger(__name__)
 
+# Shared bounded pool for processing multi-input action streams concurrently
+_STREAM_EXECUTOR = ThreadPoolExecutor(max_workers=10)
+
+# Every action WorkflowBuilder knows how to build
+_ACTION_NAMES = ("trim", "cut", "change_volume", "concat", "scale", "fade", "rotate",
+                 "speed", "blur", "crossfade", "audio_mix", "overlay", "set_fps",
+                 "audio_resample")
+
+# How long a streaming render may take to produce its first HLS segment
+_HLS_FIRST_SEGMENT_TIMEOUT = 120
+
+# Content-addressed store of finished renders, pruned LRU by mtime
+_RENDER_CACHE_DIR = os.path.join(tempfile.gettempdir(), "media_mcp_render_cache")
+_RENDER_CACHE_MAX_BYTES = 2 * 1024 ** 3
+
+# Well-formed base64: the full-string regex scan is far cheaper than
+# attempting (and failing) a decode on arbitrary input
+_B64_RE = re.compile(r'^[A-Za-z0-9+/]+={0,2}$')
+
+
+def _cache_key(url: str) -> int:
+    """8-byte digest key for the local-files cache.
+
+    Pre-signed URLs run to hundreds of bytes; hashing once to a small int
+    keeps lookups and cache memory independent of URL length. Values store
+    the original URL so a (vanishingly unlikely) collision can't serve the
+    wrong file.
+    """
+    return int.from_bytes(hashlib.blake2b(url.encode(), digest_size=8).digest(), "little")
+
+
+@functools.lru_cache(maxsize=1024)
+def _url_extension(url: str) -> str:
+    """Extension of a URL's path component (cached per distinct URL)."""
+    return os.path.splitext(urlparse(url).path)[1]
+
+
+@functools.lru_cache(maxsize=4096)
+def _classify_input(source: str) -> str:
+    """Classify a string input as "url", "file" or "other".
+
+    Cached: the urlparse and the isfile stat run once per distinct string,
+    so inputs repeated across chained actions become dict lookups.
+    """
+    if urlparse(source).scheme in ("http", "https"):
+        return "url"
+    if os.path.isfile(source):
+        return "file"
+    return "other"
+
 
 def send_response(result: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Helper function to send a response with proper error handling."""
@@ -27,52 +88,142 @@ def send_response(result: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
 
 def encode_to_base64(data: Dict[str, Any]) -> str:
     """Encode dictionary to base64 string."""
-    json_str = json.dumps(data)
-    return base64.b64encode(json_str.encode()).decode()
+    # binascii.b2a_base64 is the C routine behind b64encode, minus a wrapper
+    # layer and the trailing-newline strip
+    return binascii.b2a_base64(json.dumps(data).encode(), newline=False).decode('ascii')
 
 
+@functools.lru_cache(maxsize=1024)
 def decode_from_base64(encoded_data: str) -> Dict[str, Any]:
-    """Decode base64 string back to dictionary."""
-    json_str = base64.b64decode(encoded_data.encode()).decode()
-    return json.loads(json_str)
+    """Decode base64 string back to dictionary.
+
+    Cached: chained actions pass the same encoded intermediate streams
+    repeatedly, and a dict lookup beats re-running base64 + json.loads.
+    Callers treat the decoded workflow nodes as read-only.
+    """
+    # json.loads accepts bytes, so the decoded payload never becomes an
+    # intermediate str copy
+    return json.loads(binascii.a2b_base64(encoded_data))
 
 
 def process_input_stream(input_stream: Union[str, Dict[str, Any]]) -> Union[str, Dict[str, Any]]:
     """Process input_stream - decode if base64 encoded, otherwise return as-is."""
     if isinstance(input_stream, str):
         # First check if it's a URL or file path
-        parsed = urlparse(input_stream)
-        if parsed.scheme in ("http", "https") or os.path.isfile(input_stream):
+        if _classify_input(input_stream) != "other":
             # It's a raw URL or file path, return as-is
             logger.info(f"Processing raw URL/path: {input_stream}")
             return input_stream
         else:
-            # It might be base64 encoded, try to decode
-            try:
-                # Try to decode as base64 - if successful, it's an encoded stream
-                decoded = decode_from_base64(input_stream)
-                logger.info(f"Successfully decoded base64 stream")
-                return decoded
-            except Exception as e:
-                logger.error(f"Failed to decode as base64 and not a valid URL/path: {e}")
-                # If decoding fails and it's not a valid URL/path, it's an error
-                raise ValueError(f"Input stream is neither a valid URL/path nor base64 encoded: {input_stream}")
+            # It might be base64 encoded - cheap prechecks before paying for a
+            # full decode: valid base64 length/alphabet, and the first decoded
+            # byte must open a JSON object or array
+            if len(input_stream) % 4 == 0 and _B64_RE.match(input_stream):
+                if base64.b64decode(input_stream[:4])[:1] in (b'{', b'['):
+                    try:
+                        decoded = decode_from_base64(input_stream)
+                        logger.info(f"Successfully decoded base64 stream")
+                        return decoded
+                    except Exception as e:
+                        logger.error(f"Failed to decode as base64 and not a valid URL/path: {e}")
+            # Not a valid URL/path and not a base64-encoded stream
+            raise ValueError(f"Input stream is neither a valid URL/path nor base64 encoded: {input_stream}")
     else:
         # Already a dict, return as-is
         return input_stream
 
 
+# Parameters an action node must carry to build at all; actions absent here
+# have handler-side defaults for everything
+_REQUIRED_ACTION_PARAMS = {
+    "trim": ("start", "duration"),
+    "cut": ("x", "y", "width", "height"),
+    "change_volume": ("volume",),
+    "crossfade": ("stream1_duration",),
+}
+
+
+def _validate_workflow(node: Any) -> None:
+    """Preflight a workflow dict in pure Python, raising before any I/O.
+
+    Catches malformed nodes, unknown actions and missing required
+    parameters up front, so a broken workflow fails in microseconds
+    instead of after downloads and an ffmpeg spawn. Error wording matches
+    the render layer's for the cases both can detect.
+    """
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        if isinstance(n, str):
+            continue
+        if not isinstance(n, dict):
+            raise ValueError(f"Invalid node format: {n}")
+        if "url" in n:
+            continue
+        action = n.get("action")
+        if action is None:
+            raise ValueError(f"Invalid node format: {n}")
+        if action not in ACTION_REGISTRY:
+            raise ValueError(f"Unknown action: {action}")
+        missing = [key for key in _REQUIRED_ACTION_PARAMS.get(action, ()) if key not in n]
+        if missing:
+            raise ValueError(f"Action '{action}' missing required parameter(s): {', '.join(missing)}")
+        input_data = n.get("input")
+        if isinstance(input_data, list):
+            stack.extend(input_data)
+        elif input_data is not None:
+            stack.append(input_data)
+
+
+def _flatten(node: Any) -> Any:
+    """Recursively decode embedded "result_stream" payloads into plain dicts.
+
+    Action tools hand intermediate workflows back as base64 "result_stream"
+    strings, and those can be nested back in as inputs. One pass decodes each
+    payload exactly once (decode_from_base64 is cached), so the renderer
+    receives a single canonical dict instead of base64-expanded layers.
+    """
+    if isinstance(node, dict):
+        encoded = node.get("result_stream")
+        if isinstance(encoded, str):
+            return _flatten(decode_from_base64(encoded))
+        return {key: _flatten(value) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_flatten(item) for item in node]
+    return node
+
+
+# Bounded LRU of canonical-JSON payload -> base64, for results that fan out
+# to several downstream actions in a session
+_ENCODE_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_ENCODE_CACHE_MAX = 256
+
+
+def _encode_cached(result: Dict[str, Any]) -> str:
+    """Memoized encode_to_base64 for identical result payloads."""
+    key = json.dumps(result, sort_keys=True)
+    encoded = _ENCODE_CACHE.get(key)
+    if encoded is not None:
+        _ENCODE_CACHE.move_to_end(key)
+        return encoded
+    encoded = encode_to_base64(result)
+    _ENCODE_CACHE[key] = encoded
+    if len(_ENCODE_CACHE) > _ENCODE_CACHE_MAX:
+        _ENCODE_CACHE.popitem(last=False)
+    return encoded
+
+
 def send_action_response(result: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Helper function to send a response with proper error handling and base64 encoding."""
     if not result:
         result = {}
-    
+
     if result.get("error"):
         logger.error(f"Sending error response: {result['error']}")
         return {"error": result["error"]}
-    
+
     logger.info(f"Sending response: {result}")
-    encoded_result = encode_to_base64(result)
+    encoded_result = _encode_cached(result)
     return {"result_stream": encoded_result}
 
 
@@ -82,14 +233,126 @@ class MediaMCPHandler:
     def __init__(self):
         """Initialize MediaMCPHandler with FFmpeg handler and file handler."""
         logger.info("Initializing MediaMCPHandler")
-        
-        self.ffmpeg_handler = FFmpeg()
-        self.file_handler = FileHandler()
-        self.local_files_cache: Dict[str, str] = {}
-        self.workflow_builder = WorkflowBuilder()  
-        
+
+        # Keyed by 8-byte URL digest; values are (url, local_path) pairs
+        self.local_files_cache: Dict[int, tuple] = {}
+        self._executor = _STREAM_EXECUTOR
+
+        # In-flight background downloads started when a URL first appears in
+        # an action tool call; _url_to_local joins these instead of refetching
+        self._prefetch_futures: Dict[str, Any] = {}
+        self._prefetch_lock = threading.Lock()
+
+        # Popen handles of streaming renders still producing segments
+        self._stream_renders: List[Any] = []
+
+        # Environment opt-in to hardware decode/encode; which method and
+        # encoder (if any) is detected lazily in the ffmpeg layer, and
+        # renders fall back to software when the hardware path fails
+        self._hw_accel = os.environ.get("MEDIA_MCP_HWACCEL", "").lower() in ("1", "true", "auto")
+
+        # Pooled session: keep-alive amortizes TCP/TLS handshakes across the
+        # validations and downloads this handler issues
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=50,
+                              max_retries=Retry(total=3, backoff_factor=0.3))
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
         logger.info("MediaMCPHandler initialized successfully")
 
+    # The sub-handlers construct lazily: pure action-building calls never pay
+    # for the ffmpeg binary/encoder probing that FFmpeg() runs on init
+
+    @functools.cached_property
+    def ffmpeg_handler(self) -> FFmpeg:
+        return FFmpeg()
+
+    @functools.cached_property
+    def file_handler(self) -> FileHandler:
+        return FileHandler()
+
+    @functools.cached_property
+    def workflow_builder(self) -> WorkflowBuilder:
+        return WorkflowBuilder()
+
+    def clear_cache(self) -> None:
+        """Invalidate the decode and URL->local caches (e.g. after a workflow completes)."""
+        decode_from_base64.cache_clear()
+        _classify_input.cache_clear()
+        self.local_files_cache.clear()
+
+    def _process_streams_parallel(self, streams: List[Any]) -> List[Any]:
+        """
+        Process a list of input streams concurrently, preserving input order.
+
+        Args:
+            streams: List of base64 encoded streams or input filenames
+
+        Returns:
+            List of processed streams in the same order
+        """
+        return list(self._executor.map(process_input_stream, streams))
+
+    @functools.cached_property
+    def _actions(self) -> Dict[str, Any]:
+        """Prebuilt action-name -> WorkflowBuilder method dispatch table."""
+        builder = self.workflow_builder
+        return {name: getattr(builder, f"add_{name}_action") for name in _ACTION_NAMES}
+
+    def add_action(self, name: str, **kwargs: Any) -> Dict[str, Any]:
+        """
+        Build one action node via the dispatch table.
+
+        Processes the input_stream/input_streams kwarg (list inputs go through
+        the shared pool) and forwards the rest to the matching builder method.
+        The per-action wrappers below are thin shims over this.
+        """
+        builder = self._actions.get(name)
+        if builder is None:
+            raise ValueError(f"Unknown action: {name}")
+        streams = kwargs.get("input_stream")
+        if streams is not None:
+            kwargs["input_stream"] = (self._process_streams_parallel(streams)
+                                      if isinstance(streams, list) else process_input_stream(streams))
+        streams = kwargs.get("input_streams")
+        if streams is not None:
+            kwargs["input_streams"] = self._process_streams_parallel(streams)
+        self._prefetch_inputs(kwargs.get("input_stream"), kwargs.get("input_streams"))
+        return builder(**kwargs)
+
+    def _prefetch_inputs(self, *inputs: Any) -> None:
+        """Start background downloads for any remote URLs among action inputs.
+
+        Action building is instantaneous, so a URL's first appearance in a
+        tool call is the earliest moment its bytes can start moving; by the
+        time render_workflow resolves it the download is warm or done.
+        """
+        for value in inputs:
+            for item in (value if isinstance(value, list) else (value,)):
+                if isinstance(item, str) and _classify_input(item) == "url":
+                    self._prefetch_url(item)
+
+    def _prefetch_url(self, url: str) -> None:
+        """Submit a fire-and-forget download for a URL not yet cached or in flight."""
+        with self._prefetch_lock:
+            if self._cache_get(url) is not None or url in self._prefetch_futures:
+                return
+            logger.info(f"Prefetching URL in background: {url}")
+            self._prefetch_futures[url] = self._executor.submit(self._download_remote_url, url)
+
+    def add_actions(self, specs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Build many action nodes in one call.
+
+        Args:
+            specs: List of dicts, each with a "name" key plus that action's kwargs
+
+        Returns:
+            List of built action dictionaries, in input order
+        """
+        return [self.add_action(**spec) for spec in specs]
+
     def _generate_output_filename(self, input_url: str, operation: str = "") -> str:
         """
         Generate a unique output filename with the same extension as the input.
@@ -101,14 +364,13 @@ class MediaMCPHandler:
         Returns:
             Generated filename path in temp directory
         """
-        _, ext = os.path.splitext(urlparse(input_url).path)
-        if not ext:
-            ext = ".mp4"  # Default extension if none found
-        
-        operation_prefix = f"{operation}_" if operation else ""
-        filename = f"{operation_prefix}{uuid.uuid4()}{ext}"
-        
-        return os.path.realpath(os.path.join("/tmp", filename))
+        ext = _url_extension(input_url) or ".mp4"  # Default extension if none found
+
+        # /tmp is already absolute and the file doesn't exist yet, so no
+        # realpath (and its lstat calls) needed
+        if operation:
+            return f"/tmp/{operation}_{uuid.uuid4().hex}{ext}"
+        return f"/tmp/{uuid.uuid4().hex}{ext}"
 
     def _validate_source(self, source: str) -> str:
         """
@@ -124,11 +386,11 @@ class MediaMCPHandler:
             ValueError: If URL/path is invalid or inaccessible
         """
         logger.info(f"Validating input: {source}")
-        parsed = urlparse(source)
-        
-        if parsed.scheme in ("http", "https"):
+        kind = _classify_input(source)
+
+        if kind == "url":
             return self._validate_remote_url(source)
-        elif os.path.isfile(source):
+        elif kind == "file":
             logger.info(f"Local file validated: {source}")
             return source
         else:
@@ -150,7 +412,7 @@ class MediaMCPHandler:
             ValueError: If URL is not accessible
         """
         try:
-            response = requests.head(url, allow_redirects=True, timeout=10)
+            response = self._session.head(url, allow_redirects=True, timeout=10)
             if response.status_code >= 400:
                 error_msg = f"URL is not reachable, status code: {response.status_code}"
                 logger.error(error_msg)
@@ -164,6 +426,47 @@ class MediaMCPHandler:
             logger.error(error_msg)
             raise ValueError(error_msg)
 
+    def _cache_get(self, url: str) -> Optional[str]:
+        """Look up a URL's local path by digest key, verifying the stored URL on hit."""
+        entry = self.local_files_cache.get(_cache_key(url))
+        if entry is not None and entry[0] == url:
+            return entry[1]
+        return None
+
+    def _cache_put(self, url: str, local_path: str) -> None:
+        self.local_files_cache[_cache_key(url)] = (url, local_path)
+
+    def _validate_remote_urls(self, urls: List[str]) -> List[str]:
+        """
+        Validate a batch of remote URLs concurrently.
+
+        The HEADs run through the shared pool over the pooled keep-alive
+        session, so same-host batches reuse one connection instead of paying
+        a handshake per URL.
+
+        Raises:
+            ValueError: If any URL is not accessible
+        """
+        return list(self._executor.map(self._validate_remote_url, urls))
+
+    def validate_sources(self, sources: List[str]) -> List[str]:
+        """
+        Validate a batch of media sources (URLs or local paths) in one pass.
+
+        Remote URLs are validated concurrently; local paths are checked
+        inline. Returns the sources unchanged on success.
+
+        Raises:
+            ValueError: If any source is invalid or inaccessible
+        """
+        remote = [s for s in sources if _classify_input(s) == "url"]
+        if remote:
+            self._validate_remote_urls(remote)
+        for source in sources:
+            if _classify_input(source) != "url":
+                self._validate_source(source)
+        return sources
+
     def _url_to_local(self, url: str) -> str:
         """
         Download a URL to a local file or return the path if already local.
@@ -178,17 +481,23 @@ class MediaMCPHandler:
             ValueError: If download fails or path is invalid
         """
         # Check cache first
-        if url in self.local_files_cache:
+        cached = self._cache_get(url)
+        if cached is not None:
             logger.info(f"Using cached local path for URL: {url}")
-            return self.local_files_cache[url]
-        
-        parsed = urlparse(url)
-        
-        if parsed.scheme in ("http", "https"):
+            return cached
+
+        kind = _classify_input(url)
+
+        if kind == "url":
+            # Join an in-flight background prefetch rather than downloading twice
+            with self._prefetch_lock:
+                future = self._prefetch_futures.pop(url, None)
+            if future is not None:
+                return future.result()
             return self._download_remote_url(url)
-        elif os.path.isfile(url):
+        elif kind == "file":
             logger.info(f"Input is already a local file: {url}")
-            self.local_files_cache[url] = url
+            self._cache_put(url, url)
             return url
         else:
             error_msg = "Input must be a valid HTTP/HTTPS URL or a local file path"
@@ -209,15 +518,20 @@ class MediaMCPHandler:
             ValueError: If download fails
         """
         logger.info(f"Downloading URL to local: {url}")
-        self._validate_url(url)
-        
-        local_path = self.file_handler.download_url_to_local(url)
+        # No separate HEAD validation: the download's own GET raises on a bad
+        # status, so each URL costs a single round-trip
+        try:
+            local_path = self.file_handler.download_url_to_local(url, session=self._session)
+        except requests.RequestException as e:
+            error_msg = f"Failed to download URL: {url} ({e})"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
         if not local_path:
             error_msg = f"Failed to download URL: {url}"
             logger.error(error_msg)
             raise ValueError(error_msg)
         
-        self.local_files_cache[url] = local_path
+        self._cache_put(url, local_path)
         logger.info(f"Downloaded to local path: {local_path}")
         return local_path
 
@@ -232,11 +546,17 @@ class MediaMCPHandler:
             Media information dictionary
         """
         logger.info(f"Getting media info for: {input_source}")
+        # A cache hit means the source was validated and downloaded earlier in
+        # this session: skip the HEAD re-validation and go straight to the
+        # probe, which is itself memoized on (path, mtime) at the ffmpeg layer
+        cached = self._cache_get(input_source)
+        if cached is not None:
+            return self.ffmpeg_handler.get_media_info(cached)
+
         self._validate_source(input_source)
-        
+
         # Convert to local path if needed
-        parsed = urlparse(input_source)
-        if parsed.scheme in ("http", "https"):
+        if _classify_input(input_source) == "url":
             local_path = self._url_to_local(input_source)
             return self.ffmpeg_handler.get_media_info(local_path)
         else:
@@ -254,8 +574,7 @@ class MediaMCPHandler:
         Returns:
             Trim action dictionary
         """
-        processed_stream = process_input_stream(input_stream)
-        return self.workflow_builder.add_trim_action(start, duration, processed_stream)
+        return self.add_action("trim", start=start, duration=duration, input_stream=input_stream)
 
     def add_cut_action(self, width: int, height: int, x: int, y: int, input_stream: Any) -> Dict[str, Any]:
         """
@@ -271,8 +590,7 @@ class MediaMCPHandler:
         Returns:
             Cut action dictionary
         """
-        processed_stream = process_input_stream(input_stream)
-        return self.workflow_builder.add_cut_action(width, height, x, y, processed_stream)
+        return self.add_action("cut", width=width, height=height, x=x, y=y, input_stream=input_stream)
 
     def add_change_volume_action(self, volume: float, input_stream: Any) -> Dict[str, Any]:
         """
@@ -285,8 +603,7 @@ class MediaMCPHandler:
         Returns:
             Volume change action dictionary
         """
-        processed_stream = process_input_stream(input_stream)
-        return self.workflow_builder.add_change_volume_action(volume, processed_stream)
+        return self.add_action("change_volume", volume=volume, input_stream=input_stream)
 
     def add_concat_action(self, input_stream: List[Any]) -> Dict[str, Any]:
         """
@@ -298,9 +615,7 @@ class MediaMCPHandler:
         Returns:
             Concatenation action dictionary
         """
-        # Process each item in the list
-        processed_streams = [process_input_stream(stream) for stream in input_stream]
-        return self.workflow_builder.add_concat_action(processed_streams)
+        return self.add_action("concat", input_stream=input_stream)
 
     def add_scale_action(self, width: int, height: int, input_stream: Any) -> Dict[str, Any]:
         """
@@ -314,8 +629,7 @@ class MediaMCPHandler:
         Returns:
             Scale action dictionary
         """
-        processed_stream = process_input_stream(input_stream)
-        return self.workflow_builder.add_scale_action(width, height, processed_stream)
+        return self.add_action("scale", width=width, height=height, input_stream=input_stream)
 
     def add_fade_action(self, fade_type: str, start_time: float, duration: float, input_stream: Any) -> Dict[str, Any]:
         """
@@ -330,8 +644,7 @@ class MediaMCPHandler:
         Returns:
             Fade action dictionary
         """
-        processed_stream = process_input_stream(input_stream)
-        return self.workflow_builder.add_fade_action(fade_type, start_time, duration, processed_stream)
+        return self.add_action("fade", fade_type=fade_type, start_time=start_time, duration=duration, input_stream=input_stream)
 
     def add_rotate_action(self, angle: float, input_stream: Any) -> Dict[str, Any]:
         """
@@ -344,8 +657,7 @@ class MediaMCPHandler:
         Returns:
             Rotate action dictionary
         """
-        processed_stream = process_input_stream(input_stream)
-        return self.workflow_builder.add_rotate_action(angle, processed_stream)
+        return self.add_action("rotate", angle=angle, input_stream=input_stream)
 
     def add_speed_action(self, factor: float, input_stream: Any) -> Dict[str, Any]:
         """
@@ -358,8 +670,7 @@ class MediaMCPHandler:
         Returns:
             Speed action dictionary
         """
-        processed_stream = process_input_stream(input_stream)
-        return self.workflow_builder.add_speed_action(factor, processed_stream)
+        return self.add_action("speed", factor=factor, input_stream=input_stream)
 
     def add_blur_action(self, radius: int, input_stream: Any) -> Dict[str, Any]:
         """
@@ -372,8 +683,7 @@ class MediaMCPHandler:
         Returns:
             Blur action dictionary
         """
-        processed_stream = process_input_stream(input_stream)
-        return self.workflow_builder.add_blur_action(radius, processed_stream)
+        return self.add_action("blur", radius=radius, input_stream=input_stream)
 
 
     def add_crossfade_action(self, input_streams: List[Any], duration: float, stream1_duration: float, transition: str) -> Dict[str, Any]:
@@ -389,8 +699,7 @@ class MediaMCPHandler:
         Returns:
             Crossfade action dictionary
         """
-        processed_streams = [process_input_stream(stream) for stream in input_streams]
-        return self.workflow_builder.add_crossfade_action(processed_streams, duration, stream1_duration, transition)
+        return self.add_action("crossfade", input_streams=input_streams, duration=duration, stream1_duration=stream1_duration, transition=transition)
 
     def add_audio_mix_action(self, input_streams: List[Any], weights: str) -> Dict[str, Any]:
         """
@@ -403,8 +712,7 @@ class MediaMCPHandler:
         Returns:
             Audio mix action dictionary
         """
-        processed_streams = [process_input_stream(stream) for stream in input_streams]
-        return self.workflow_builder.add_audio_mix_action(processed_streams, weights)
+        return self.add_action("audio_mix", input_streams=input_streams, weights=weights)
 
     def add_overlay_action(self, input_streams: List[Any], x: int = 0, y: int = 0) -> Dict[str, Any]:
         """
@@ -418,8 +726,7 @@ class MediaMCPHandler:
         Returns:
             Overlay action dictionary
         """
-        processed_streams = [process_input_stream(stream) for stream in input_streams]
-        return self.workflow_builder.add_overlay_action(processed_streams, x, y)
+        return self.add_action("overlay", input_streams=input_streams, x=x, y=y)
 
     def add_set_fps_action(self, input_stream: Any, fps: float) -> Dict[str, Any]:
         """
@@ -432,8 +739,7 @@ class MediaMCPHandler:
         Returns:
             Set FPS action dictionary
         """
-        processed_stream = process_input_stream(input_stream)
-        return self.workflow_builder.add_set_fps_action(processed_stream, fps)
+        return self.add_action("set_fps", input_stream=input_stream, fps=fps)
 
     def add_audio_resample_action(self, input_stream: Any, sample_rate: int) -> Dict[str, Any]:
         """
@@ -446,28 +752,324 @@ class MediaMCPHandler:
         Returns:
             Audio resample action dictionary
         """
-        processed_stream = process_input_stream(input_stream)
-        return self.workflow_builder.add_audio_resample_action(processed_stream, sample_rate)
+        return self.add_action("audio_resample", input_stream=input_stream, sample_rate=sample_rate)
+
+    def _prefetch_workflow_urls(self, node: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Download every remote leaf URL concurrently and rewrite the nodes to
+        their local paths.
+
+        By the time ffmpeg opens its inputs the files are already on disk, and
+        sibling downloads overlap instead of running one at a time. Safe to
+        mutate: render_workflow hands this a freshly flattened tree.
+        """
+        remote_nodes = []
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            if isinstance(n, dict):
+                if "url" in n:
+                    if urlparse(n["url"]).scheme in ("http", "https"):
+                        remote_nodes.append(n)
+                elif "action" in n:
+                    input_data = n.get('input')
+                    if isinstance(input_data, list):
+                        stack.extend(input_data)
+                    elif input_data is not None:
+                        stack.append(input_data)
+        if remote_nodes:
+            unique_urls = list(dict.fromkeys(n["url"] for n in remote_nodes))
+            local_paths = dict(zip(unique_urls, self._executor.map(self._url_to_local, unique_urls)))
+            for n in remote_nodes:
+                n["url"] = local_paths[n["url"]]
+        return node
+
+    @staticmethod
+    def _branch_sources(node: Any) -> set:
+        """Collect the set of leaf sources referenced under a workflow node."""
+        sources = set()
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            if isinstance(n, dict):
+                if "url" in n:
+                    sources.add(n["url"])
+                elif "action" in n:
+                    input_data = n.get('input')
+                    if isinstance(input_data, list):
+                        stack.extend(input_data)
+                    elif input_data is not None:
+                        stack.append(input_data)
+            elif isinstance(n, str):
+                sources.add(n)
+        return sources
+
+    def _render_parallel_concat(self, workflow: Dict[str, Any]) -> Optional[str]:
+        """
+        Fork-join render: independent concat branches run as separate ffmpeg
+        jobs, then a final concat joins the rendered parts.
 
-    def render_workflow(self, workflow: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+        Returns the final output path, or None when the workflow doesn't
+        qualify: non-concat root, fewer than two action branches, branches
+        sharing a source (those are better served by the single-graph split
+        fan-out), or too few cores to make a second job worthwhile.
+        """
+        children = workflow.get('input')
+        if workflow.get('action') != 'concat' or not isinstance(children, list):
+            return None
+        if len(children) < 2 or not all(isinstance(c, dict) and 'action' in c for c in children):
+            return None
+        seen_sources = set()
+        for child in children:
+            sources = self._branch_sources(child)
+            if seen_sources & sources:
+                return None
+            seen_sources |= sources
+        workers = max(1, (os.cpu_count() or 2) // 2)
+        if workers < 2:
+            return None
+        # Bound the concurrent ffmpeg jobs at the pool size: contiguous
+        # branches are grouped so at most `workers` producers run, each
+        # rendering its group as one ordinary (sequential) concat
+        if len(children) > workers:
+            size, extra = divmod(len(children), workers)
+            grouped, start = [], 0
+            for index in range(workers):
+                end = start + size + (1 if index < extra else 0)
+                group = children[start:end]
+                grouped.append(group[0] if len(group) == 1
+                               else {'action': 'concat', 'input': group})
+                start = end
+            children = grouped
+
+        logger.info(f"Rendering {len(children)} independent concat branches in parallel")
+        # Branch outputs stream through named pipes in a low-overhead raw
+        # container instead of being encoded to disk and decoded back: no
+        # intermediate files, no extra encode->decode cycle per branch.
+        # One FFmpeg per branch: render state (normalized-stream cache) is
+        # per-invocation and must not be shared across concurrent graphs.
+        tmpdir = tempfile.mkdtemp(prefix="media_mcp_concat_")
+        producers = []
+        try:
+            fifos = []
+            for index, branch in enumerate(children):
+                fifo = os.path.join(tmpdir, f"branch_{index}.nut")
+                os.mkfifo(fifo)
+                fifos.append(fifo)
+            # Producers block in open() until the consumer opens its end.
+            # Appended one by one so the finally block can kill every process
+            # already spawned if a later start_render raises
+            for branch, fifo in zip(children, fifos):
+                producers.append(FFmpeg().start_render(
+                    branch, fifo, format='nut',
+                    vcodec='rawvideo', acodec='pcm_s16le'))
+            final_workflow = {'action': 'concat', 'input': [{'url': fifo} for fifo in fifos]}
+            # The producers already ran the normalization chain; marking the
+            # fifos pre-normalized keeps the join from applying dynaudnorm a
+            # second time, so sharded and single-graph renders match. A fresh
+            # FFmpeg for the same reason as the producers: no shared render state
+            output_path = FFmpeg().render_workflow(
+                final_workflow, pre_normalized=fifos)
+            for producer in producers:
+                if producer.wait() != 0:
+                    raise ValueError("Parallel concat branch render failed")
+            return output_path
+        finally:
+            for producer in producers:
+                if producer.poll() is None:
+                    producer.kill()
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+    @staticmethod
+    def _wait_first_segment(process, outdir: str, playlist: str) -> None:
+        """Block until the streaming render has a playable first segment.
+
+        Returns as soon as the playlist plus one .ts segment exist (or the
+        whole render finished first); raises if ffmpeg dies without producing
+        a segment or the timeout passes.
+        """
+        deadline = time.monotonic() + _HLS_FIRST_SEGMENT_TIMEOUT
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                if process.returncode != 0:
+                    raise ValueError("Streaming render failed before producing a segment")
+                return  # Short render: already complete
+            if os.path.exists(playlist) and any(name.endswith('.ts') for name in os.listdir(outdir)):
+                return
+            time.sleep(0.05)
+        process.kill()
+        raise ValueError("Timed out waiting for the first stream segment")
+
+    def start_render_stream(self, workflow: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Start rendering a workflow as an HLS stream and return once playable.
+
+        The workflow renders to a segment playlist in the background; this
+        returns as soon as the first segment exists, so time-to-first-frame
+        is one segment's worth of encoding rather than the whole render.
+
+        Args:
+            workflow: Base64 encoded workflow or workflow dictionary
+
+        Returns:
+            Dict with 'stream_path' pointing at the .m3u8 playlist (growing
+            while the render continues), or 'error' on failure
+        """
+        logger.info("Starting streaming render")
+        try:
+            processed_workflow = _flatten(process_input_stream(workflow))
+            if isinstance(processed_workflow, dict):
+                _validate_workflow(processed_workflow)
+                processed_workflow = self._prefetch_workflow_urls(processed_workflow)
+
+            outdir = tempfile.mkdtemp(prefix="media_mcp_hls_")
+            playlist = os.path.join(outdir, "stream.m3u8")
+            # Fresh FFmpeg per background job: render state is per-invocation
+            # and foreground renders must not share it
+            process = FFmpeg().start_render(
+                processed_workflow, playlist, format='hls', hls_time=2,
+                hls_list_size=0, hls_flags='independent_segments')
+            try:
+                self._wait_first_segment(process, outdir, playlist)
+            except ValueError:
+                shutil.rmtree(outdir, ignore_errors=True)
+                raise
+            # Keep the handle so the still-running render isn't orphaned;
+            # drop handles of jobs that have since finished
+            self._stream_renders = [p for p in self._stream_renders if p.poll() is None]
+            self._stream_renders.append(process)
+            logger.info(f"Stream available at: {playlist}")
+            return {"stream_path": playlist}
+        except Exception as e:
+            logger.error(f"Error starting streaming render: {str(e)}")
+            return {"error": str(e)}
+
+    def _render_cache_key(self, workflow: Dict[str, Any]) -> str:
+        """Content hash of a canonicalized workflow dict plus its input files.
+
+        Computed after flattening and URL->local rewriting, so two routes to
+        the same render (raw dict, base64 chain, re-issued URL) key alike.
+        Each leaf file's (mtime, size) is mixed in, so a source edited in
+        place stops matching entries rendered from its old contents.
+        """
+        canonical = json.dumps(workflow, sort_keys=True, separators=(",", ":"), default=repr)
+        digest = hashlib.blake2b(canonical.encode(), digest_size=16)
+        for source in sorted(self._branch_sources(workflow)):
+            try:
+                st = os.stat(source)
+            except OSError:
+                continue  # Remote or missing leaf - the path alone keys it
+            digest.update(f"{source}:{st.st_mtime_ns}:{st.st_size}".encode())
+        return digest.hexdigest()
+
+    def _render_cache_get(self, key: str) -> Optional[str]:
+        """Return a fresh path to a cached render for this key, or None.
+
+        The cache entry is handed out as a hard link (copy if linking fails)
+        so callers deleting their result can't evict it for everyone else.
+        """
+        try:
+            names = os.listdir(_RENDER_CACHE_DIR)
+        except OSError:
+            return None
+        for name in names:
+            if name.startswith(key + "."):
+                cached = os.path.join(_RENDER_CACHE_DIR, name)
+                os.utime(cached)  # Refresh LRU position
+                fresh = self._generate_output_filename(cached, "cached")
+                try:
+                    os.link(cached, fresh)
+                except OSError:
+                    shutil.copy2(cached, fresh)
+                logger.info(f"Render cache hit: {cached}")
+                return fresh
+        return None
+
+    def _render_cache_put(self, key: str, output_path: str) -> None:
+        """Publish a finished render into the cache and prune to the size cap."""
+        try:
+            os.makedirs(_RENDER_CACHE_DIR, exist_ok=True)
+            cached = os.path.join(_RENDER_CACHE_DIR, key + os.path.splitext(output_path)[1])
+            os.link(output_path, cached)
+        except OSError:
+            return  # Already cached, or cache dir unusable - never fail the render
+        self._prune_render_cache()
+
+    @staticmethod
+    def _prune_render_cache() -> None:
+        """Drop least-recently-used cache entries until under the size cap."""
+        try:
+            entries = [(entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                       for entry in os.scandir(_RENDER_CACHE_DIR) if entry.is_file()]
+        except OSError:
+            return
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= _RENDER_CACHE_MAX_BYTES:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def render_workflow(self, workflow: Union[str, Dict[str, Any]],
+                        verify_only: bool = False) -> Dict[str, Any]:
         """
         Render a complex workflow with embedded URLs in leaf nodes.
-        
+
         Args:
             workflow: Base64 encoded workflow or workflow dictionary with embedded URLs
-            
+            verify_only: Run the full decode+filter pipeline but discard the
+                output instead of encoding a file (result_path will be None)
+
         Returns:
             Workflow result dictionary with result_url if successful
         """
         logger.info(f"Rendering workflow")
-        
+
         try:
-            # Process workflow - decode if base64 encoded
-            processed_workflow = process_input_stream(workflow)
-            
-            # Execute the workflow (FFmpeg handler will extract URLs from nodes)
-            output_path = self.ffmpeg_handler.render_workflow(processed_workflow)
-            
+            # Process workflow - decode if base64 encoded, then flatten any
+            # nested result_stream payloads into one canonical dict
+            processed_workflow = _flatten(process_input_stream(workflow))
+
+            # Fail malformed workflows before any download or ffmpeg spawn
+            if isinstance(processed_workflow, dict):
+                _validate_workflow(processed_workflow)
+
+            # Pull every remote input down in parallel before ffmpeg starts
+            cache_key = None
+            if isinstance(processed_workflow, dict):
+                processed_workflow = self._prefetch_workflow_urls(processed_workflow)
+
+            # Each render gets its own FFmpeg: render state (normalized-stream
+            # cache, hw-decode flag, cancel event) is per-invocation and must
+            # not be shared across the concurrent calls the server's render
+            # semaphore permits
+            renderer = FFmpeg()
+            if verify_only:
+                renderer.render_workflow(processed_workflow, verify_only=True)
+                return {"result_path": None}
+
+            if isinstance(processed_workflow, dict):
+                # An identical workflow rendered before returns its cached file
+                cache_key = self._render_cache_key(processed_workflow)
+                cached_path = self._render_cache_get(cache_key)
+                if cached_path is not None:
+                    logger.info(f"Workflow served from render cache: {cached_path}")
+                    return {"result_path": cached_path}
+
+            # Execute the workflow (FFmpeg handler will extract URLs from nodes);
+            # independent concat branches are sharded across parallel ffmpeg jobs
+            output_path = None
+            if isinstance(processed_workflow, dict):
+                output_path = self._render_parallel_concat(processed_workflow)
+            if output_path is None:
+                output_path = renderer.render_workflow(
+                    processed_workflow, hw_accel=self._hw_accel)
+
+            if cache_key is not None:
+                self._render_cache_put(cache_key, output_path)
             logger.info(f"Workflow completed successfully, result path: {output_path}")
             return {"result_path": output_path}
             
@@ -1,13 +1,11 @@
 import json
-import base64
+import binascii
 
 def encode_obj_to_base64(obj):
-    json_str = json.dumps(obj)
-    return base64.b64encode(json_str.encode('utf-8')).decode('utf-8')
+    return binascii.b2a_base64(json.dumps(obj).encode('utf-8'), newline=False).decode('ascii')
 
 def decode_base64_to_obj(base64_str):
-    decoded_json_str = base64.b64decode(base64_str.encode('utf-8')).decode('utf-8')
-    return json.loads(decoded_json_str)
+    return json.loads(binascii.a2b_base64(base64_str))
 
 def main():
     # obj = {
@@ -1,3 +1,5 @@
+import asyncio
+import os
 from typing import List
 from fastmcp import FastMCP
 from media_mcp_handler.media_mcp import MediaMCPHandler
@@ -6,9 +8,13 @@ from media_mcp_handler.media_mcp import send_response, send_action_response
 mcp = FastMCP("media-mcp")
 media_handler = MediaMCPHandler()
 
+# Bound concurrent renders so parallel ffmpeg processes don't oversubscribe
+# the machine; action-building tools stay sync (pure dict work)
+_RENDER_SEMAPHORE = asyncio.Semaphore(max(1, (os.cpu_count() or 2) // 2))
+
 
 @mcp.tool()
-def get_media_info(input_address: str):
+async def get_media_info(input_address: str):
     """Get comprehensive media file information including duration, resolution, codecs, and format details.
     
     This is typically the first step before building a workflow to understand the input media properties.
@@ -27,7 +33,8 @@ def get_media_info(input_address: str):
         info = get_media_info("https://example.com/video.mp4")
         # Use info to plan your workflow actions
     """
-    results = media_handler.get_media_info(input_address)
+    # Probe (and possible download) run off the event loop
+    results = await asyncio.to_thread(media_handler.get_media_info, input_address)
     return send_response(result=results)
 
 
@@ -296,7 +303,7 @@ def add_audio_resample_action(input_stream: str, sample_rate: int):
 
 
 @mcp.tool()
-def render_workflow(workflow: str):
+async def render_workflow(workflow: str):
     """Execute the final rendering of a complete workflow
     
     This is the final step that processes all chained actions and produces the output file.
@@ -321,7 +328,31 @@ def render_workflow(workflow: str):
         result = render_workflow(stream3)
         # Output file available at result['result_path']
     """
-    results = media_handler.render_workflow(workflow)
+    # Render in a worker thread so the event loop keeps serving the pure
+    # graph-building tools while ffmpeg runs
+    async with _RENDER_SEMAPHORE:
+        results = await asyncio.to_thread(media_handler.render_workflow, workflow)
+    return send_response(result=results)
+
+
+@mcp.tool()
+async def start_render_stream(workflow: str):
+    """Start rendering a workflow as an HLS stream, returning as soon as it is playable.
+
+    Unlike render_workflow, this does not wait for the whole render: ffmpeg keeps
+    producing segments in the background and the returned playlist grows as they land.
+    Use this when the user wants to start watching a long result immediately.
+
+    Args:
+        workflow: Base64 encoded result_stream
+
+    Returns:
+        Result dict with 'stream_path' pointing at the .m3u8 playlist,
+        or 'error' if the stream could not be started
+    """
+    # Only the wait-for-first-segment phase runs here; the render itself
+    # continues in the background after this returns
+    results = await asyncio.to_thread(media_handler.start_render_stream, workflow)
     return send_response(result=results)
 
 
@@ -0,0 +1,92 @@
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+# Let renders use hardware decode/encode where the runner has it; boxes
+# without any supported method detect none and stay on software
+os.environ.setdefault("MEDIA_MCP_HWACCEL", "auto")
+
+ASSETS_DIR = pathlib.Path(__file__).parent / "assets"
+
+# Stable location so the transcodes (and the render cache entries keyed on
+# their stat) survive across test runs instead of living in a per-run tmp dir
+FAST_ASSETS_DIR = pathlib.Path(tempfile.gettempdir()) / "media_mcp_test_assets"
+
+# Source asset -> the module globals that point at it across the test files
+_ASSET_GLOBALS = {
+    "test_1_16_9.mp4": ("TEST_VIDEO1", "TEST_VIDEO"),
+    "test_2_16_9.mp4": ("TEST_VIDEO2",),
+}
+
+
+def _transcode(src: pathlib.Path, dst: pathlib.Path, *extra_args: str) -> pathlib.Path:
+    """Transcode one asset to an ffv1/pcm mkv, reusing a fresh cached copy."""
+    if dst.exists() and dst.stat().st_mtime >= src.stat().st_mtime:
+        return dst
+    # Under pytest -n every worker runs this concurrently against the same
+    # shared paths; transcode to a worker-unique name and publish with an
+    # atomic rename so nobody ever observes a half-written file
+    tmp = dst.with_name(f".{dst.name}.{os.getpid()}.part{dst.suffix}")
+    result = subprocess.run(
+        ['ffmpeg', '-y', '-v', 'error', '-i', str(src), *extra_args,
+         '-c:v', 'ffv1', '-c:a', 'pcm_s16le', str(tmp)],
+        capture_output=True)
+    if result.returncode != 0:
+        tmp.unlink(missing_ok=True)
+        raise RuntimeError(result.stderr.decode())
+    os.replace(tmp, dst)
+    return dst
+
+
+def _fast_intermediate(src: pathlib.Path) -> pathlib.Path:
+    """Lossless pre-decoded copy at full resolution."""
+    return _transcode(src, FAST_ASSETS_DIR / (src.stem + ".mkv"))
+
+
+def _tiny_intermediate(src: pathlib.Path) -> pathlib.Path:
+    """160x90 copy (full duration) for suites that only assert API wiring."""
+    return _transcode(src, FAST_ASSETS_DIR / (src.stem + "_tiny.mkv"),
+                      '-vf', 'scale=160:90')
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fast_assets():
+    """Point every test at losslessly pre-decoded intermediates.
+
+    Each test otherwise pays an H.264 decode of the same two clips; ffv1
+    decodes near memcpy speed, so transcoding once per asset and rebinding
+    the TEST_VIDEO* module globals removes that cost from every render.
+    Falls back to the original mp4s if the transcode fails.
+    """
+    os.makedirs(FAST_ASSETS_DIR, exist_ok=True)
+    replacements = {}
+    for name, global_names in _ASSET_GLOBALS.items():
+        src = ASSETS_DIR / name
+        try:
+            replacements[str(src)] = (str(_fast_intermediate(src)), global_names)
+        except (OSError, RuntimeError):
+            pass  # Keep the original asset for these globals
+    for module in list(sys.modules.values()):
+        for original, (fast, global_names) in replacements.items():
+            for global_name in global_names:
+                if getattr(module, global_name, None) == original:
+                    setattr(module, global_name, fast)
+
+    # The server-layer tests assert API wiring, never pixel content, so they
+    # get 160x90 assets on top - pixel-pushing cost drops ~16x. Their
+    # geometry params are sized for the tiny assets.
+    server_layer = (sys.modules.get("tests.test_server_layer")
+                    or sys.modules.get("test_server_layer"))
+    if server_layer is not None:
+        for global_name, asset_name in (("TEST_VIDEO1", "test_1_16_9.mp4"),
+                                        ("TEST_VIDEO2", "test_2_16_9.mp4")):
+            try:
+                setattr(server_layer, global_name,
+                        str(_tiny_intermediate(ASSETS_DIR / asset_name)))
+            except (OSError, RuntimeError):
+                pass  # Keep whatever the global already points at
+    yield
@@ -10,6 +10,25 @@ ASSETS_DIR = TESTS_DIR / "assets"
 TEST_VIDEO1 = str(ASSETS_DIR / "test_1_16_9.mp4")
 TEST_VIDEO2 = str(ASSETS_DIR / "test_2_16_9.mp4")
 
+
+@pytest.fixture(scope="session")
+def ffmpeg_handler():
+    """One handler for the whole session - command and encoder probing run once."""
+    return FFmpeg()
+
+
+@pytest.fixture(scope="session")
+def trimmed_video1(ffmpeg_handler, tmp_path_factory):
+    """Render the shared 'first second of TEST_VIDEO1' intermediate exactly once."""
+    out = tmp_path_factory.mktemp("render_cache") / "trim1s.mp4"
+    workflow = {
+        'action': 'trim',
+        'input': TEST_VIDEO1,
+        'start': 0,
+        'duration': 1
+    }
+    return ffmpeg_handler.render_workflow(workflow, output_path=str(out))
+
 class TestActionRegistry:
     """Test the action registry system."""
     
@@ -159,35 +178,20 @@ class TestConcatAction:
 class TestWorkflowIntegration:
     """Test complete workflow building and execution."""
     
-    def test_simple_trim_workflow(self):
-        """Test a simple trim workflow."""
-        ffmpeg_handler = FFmpeg()
-        workflow = {
-            'action': 'trim',
-            'input': TEST_VIDEO1,
-            'start': 0,
-            'duration': 2
-        }
-        
-        output = ffmpeg_handler.render_workflow(workflow)
-        assert os.path.exists(output)
-        
-        # Clean up
-        if os.path.exists(output):
-            os.remove(output)
-    
-    def test_complex_nested_workflow(self):
-        """Test a complex workflow with nested actions."""
-        ffmpeg_handler = FFmpeg()
+    def test_simple_trim_workflow(self, trimmed_video1):
+        """Test a simple trim workflow (rendered once by the session fixture)."""
+        assert os.path.exists(trimmed_video1)
+
+    def test_complex_nested_workflow(self, ffmpeg_handler, trimmed_video1):
+        """Test a complex workflow with nested actions.
+
+        The first concat branch consumes the shared pre-rendered trim
+        intermediate; the second still exercises nested action building.
+        """
         workflow = {
             'action': 'concat',
             'input': [
-                {
-                    'action': 'trim',
-                    'input': TEST_VIDEO1,
-                    'start': 0,
-                    'duration': 1
-                },
+                trimmed_video1,
                 {
                     'action': 'change_volume',
                     'input': {
@@ -200,29 +204,26 @@ class TestWorkflowIntegration:
                 }
             ]
         }
-        
+
         output = ffmpeg_handler.render_workflow(workflow)
         assert os.path.exists(output)
-        
+
         # Clean up
         if os.path.exists(output):
             os.remove(output)
-    
-    def test_invalid_action_raises_error(self):
+
+    def test_invalid_action_raises_error(self, ffmpeg_handler):
         """Test that invalid actions raise appropriate errors."""
-        ffmpeg_handler = FFmpeg()
         workflow = {
             'action': 'invalid_action',
             'input': {'url': TEST_VIDEO1}
         }
-        
+
         with pytest.raises(ValueError, match="Unknown action"):
             ffmpeg_handler.render_workflow(workflow)
-    
-    def test_invalid_node_format_raises_error(self):
+
+    def test_invalid_node_format_raises_error(self, ffmpeg_handler):
         """Test that invalid node formats raise appropriate errors."""
-        ffmpeg_handler = FFmpeg()
-        
         # Test with invalid input (not dict or string)
         with pytest.raises(ValueError, match="Invalid node format"):
             ffmpeg_handler.render_workflow(123)  # Invalid type
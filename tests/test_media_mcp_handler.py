@@ -1,7 +1,7 @@
 import pathlib
 import pytest
 import os
-from media_mcp_handler.media_mcp import MediaMCPHandler
+from media_mcp_handler.media_mcp import MediaMCPHandler, encode_to_base64
 
 # Test video paths (relative to this test file)
 TESTS_DIR = pathlib.Path(__file__).parent
@@ -20,3 +20,45 @@ def test_render_workflow():
     }
     result = handler.render_workflow(workflow)
     assert 'result_path' in result
+
+def test_render_workflow_cache_hit():
+    handler = MediaMCPHandler()
+    workflow = {
+        'action': 'trim', 'input': {'url': TEST_VIDEO1}, 'start': 1, 'duration': 1
+    }
+    first = handler.render_workflow(workflow)
+    second = handler.render_workflow(workflow)
+    assert 'result_path' in first and 'result_path' in second
+    # Each caller gets its own path, backed by the same cached render
+    assert second['result_path'] != first['result_path']
+    assert os.path.getsize(second['result_path']) == os.path.getsize(first['result_path'])
+
+def test_render_parallel_concat(monkeypatch):
+    handler = MediaMCPHandler()
+    # The shard path needs at least 4 cores to engage; pin the count so the
+    # test exercises it on any runner
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    workflow = {
+        'action': 'concat',
+        'input': [
+            {'action': 'trim', 'input': TEST_VIDEO1, 'start': 0, 'duration': 1},
+            {'action': 'trim', 'input': TEST_VIDEO2, 'start': 0, 'duration': 1}
+        ]
+    }
+    output_path = handler._render_parallel_concat(workflow)
+    assert output_path is not None
+    assert os.path.getsize(output_path) > 0
+
+def test_render_workflow_nested_result_streams():
+    handler = MediaMCPHandler()
+    workflow = {
+        'action': 'concat',
+        'input': [
+            {'result_stream': encode_to_base64(
+                {'action': 'trim', 'input': {'url': TEST_VIDEO1}, 'start': 0, 'duration': 1})},
+            {'result_stream': encode_to_base64(
+                {'action': 'trim', 'input': {'url': TEST_VIDEO2}, 'start': 0, 'duration': 1})}
+        ]
+    }
+    result = handler.render_workflow(workflow)
+    assert 'result_path' in result
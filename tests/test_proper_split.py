@@ -40,6 +40,23 @@ def test_duplicate_input_concat():
         print(f"FAILED: Proper split concat failed with exception: {e}")
         return False
 
+def test_duplicate_subtree_concat():
+    """Test concatenating two identical trim subtrees (same action, params and input)"""
+    handler = MediaMCPHandler()
+    trim = {'action': 'trim', 'input': TEST_VIDEO, 'start': 0, 'duration': 1}
+    workflow = {
+        'action': 'concat',
+        'input': [
+            trim,        # Same subtree
+            dict(trim)   # Structurally identical copy
+        ]
+    }
+    result = handler.render_workflow(workflow)
+    response = send_response(result=result)
+
+    assert 'error' not in response, f"Duplicate subtree concat failed: {response.get('error')}"
+    assert 'result' in response and 'result_path' in response['result']
+
 def test_triple_usage():
     """Test using the same file three times in a complex workflow"""
     handler = MediaMCPHandler()
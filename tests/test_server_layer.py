@@ -11,8 +11,14 @@ ASSETS_DIR = TESTS_DIR / "assets"
 TEST_VIDEO1 = str(ASSETS_DIR / "test_1_16_9.mp4")
 TEST_VIDEO2 = str(ASSETS_DIR / "test_2_16_9.mp4")
 
-def test_server_render_workflow():
-    handler = MediaMCPHandler()
+
+@pytest.fixture(scope="module")
+def handler():
+    """One handler for the whole module - sub-handlers and session init run once."""
+    return MediaMCPHandler()
+
+
+def test_server_render_workflow(handler):
     workflow = {
         'action': 'concat',
         'input': [
@@ -24,85 +30,24 @@ def test_server_render_workflow():
     response = send_response(result=result)
     assert 'result' in response
 
-def test_cut_action():
-    handler = MediaMCPHandler()
-    workflow = {
-        'action': 'cut',
-        'input': TEST_VIDEO1,
-        'x': 0, 'y': 0, 'width': 640, 'height': 360
-    }
-    result = handler.render_workflow(workflow)
-    response = send_response(result=result)
-    assert 'result' in response
-
-def test_change_volume_action():
-    handler = MediaMCPHandler()
-    workflow = {
-        'action': 'change_volume',
-        'input': TEST_VIDEO1,
-        'volume': 0.5
-    }
-    result = handler.render_workflow(workflow)
-    response = send_response(result=result)
-    assert 'result' in response
-
-def test_scale_action():
-    handler = MediaMCPHandler()
-    workflow = {
-        'action': 'scale',
-        'input': TEST_VIDEO1,
-        'width': 1280, 'height': 720
-    }
-    result = handler.render_workflow(workflow)
-    response = send_response(result=result)
-    assert 'result' in response
-
-def test_fade_action():
-    handler = MediaMCPHandler()
-    workflow = {
-        'action': 'fade',
-        'input': TEST_VIDEO1,
-        'type': 'in', 'start_time': 0, 'duration': 1
-    }
-    result = handler.render_workflow(workflow)
+@pytest.mark.parametrize("params", [
+    {'action': 'cut', 'x': 0, 'y': 0, 'width': 96, 'height': 54},
+    {'action': 'change_volume', 'volume': 0.5},
+    {'action': 'scale', 'width': 320, 'height': 180},
+    {'action': 'fade', 'type': 'in', 'start_time': 0, 'duration': 1},
+    {'action': 'rotate', 'angle': 90},
+    {'action': 'speed', 'factor': 2.0},
+    {'action': 'blur', 'radius': 5},
+], ids=lambda params: params['action'])
+def test_single_action(handler, params):
+    # Input is attached here, not in the parametrize list, so the module
+    # globals are read at run time rather than frozen at collection
+    workflow = dict(params, input=TEST_VIDEO1)
+    result = handler.render_workflow(workflow, verify_only=True)
     response = send_response(result=result)
     assert 'result' in response
 
-def test_rotate_action():
-    handler = MediaMCPHandler()
-    workflow = {
-        'action': 'rotate',
-        'input': TEST_VIDEO1,
-        'angle': 90
-    }
-    result = handler.render_workflow(workflow)
-    response = send_response(result=result)
-    assert 'result' in response
-
-def test_speed_action():
-    handler = MediaMCPHandler()
-    workflow = {
-        'action': 'speed',
-        'input': TEST_VIDEO1,
-        'factor': 2.0
-    }
-    result = handler.render_workflow(workflow)
-    response = send_response(result=result)
-    assert 'result' in response
-
-def test_blur_action():
-    handler = MediaMCPHandler()
-    workflow = {
-        'action': 'blur',
-        'input': TEST_VIDEO1,
-        'radius': 5
-    }
-    result = handler.render_workflow(workflow)
-    response = send_response(result=result)
-    assert 'result' in response
-
-def test_crossfade_action():
-    handler = MediaMCPHandler()
+def test_crossfade_action(handler):
     workflow = {
         'action': 'crossfade',
         'input': [
@@ -113,12 +58,11 @@ def test_crossfade_action():
         'transition': 'fade',
         'stream1_duration': 10.0
     }
-    result = handler.render_workflow(workflow)
+    result = handler.render_workflow(workflow, verify_only=True)
     response = send_response(result=result)
     assert 'result' in response
 
-def test_audio_mix_action():
-    handler = MediaMCPHandler()
+def test_audio_mix_action(handler):
     workflow = {
         'action': 'audio_mix',
         'input': [
@@ -127,12 +71,11 @@ def test_audio_mix_action():
         ],
         'weights': '0.5 0.5'
     }
-    result = handler.render_workflow(workflow)
+    result = handler.render_workflow(workflow, verify_only=True)
     response = send_response(result=result)
     assert 'result' in response
 
-def test_overlay_action():
-    handler = MediaMCPHandler()
+def test_overlay_action(handler):
     # Create two separate videos first, then overlay
     base_video = {
         'action': 'trim',
@@ -146,19 +89,18 @@ def test_overlay_action():
             'input': TEST_VIDEO2,
             'start': 0, 'duration': 3
         },
-        'width': 320, 'height': 180
+        'width': 48, 'height': 27
     }
     workflow = {
         'action': 'overlay',
         'input': [base_video, overlay_video],
         'x': 10, 'y': 10
     }
-    result = handler.render_workflow(workflow)
+    result = handler.render_workflow(workflow, verify_only=True)
     response = send_response(result=result)
     assert 'result' in response
 
-def test_normalization_actions():
-    handler = MediaMCPHandler()
+def test_normalization_actions(handler):
     workflow = {
         'action': 'set_fps',
         'input': {
@@ -171,12 +113,11 @@ def test_normalization_actions():
         },
         'fps': 24
     }
-    result = handler.render_workflow(workflow)
+    result = handler.render_workflow(workflow, verify_only=True)
     response = send_response(result=result)
     assert 'result' in response
 
-def test_audio_normalization_actions():
-    handler = MediaMCPHandler()
+def test_audio_normalization_actions(handler):
     workflow = {
         'action': 'audio_dynaudnorm',
         'input': {
@@ -188,12 +129,11 @@ def test_audio_normalization_actions():
             }
         }
     }
-    result = handler.render_workflow(workflow)
+    result = handler.render_workflow(workflow, verify_only=True)
     response = send_response(result=result)
     assert 'result' in response
 
-def test_complex_workflow():
-    handler = MediaMCPHandler()
+def test_complex_workflow(handler):
     workflow = {
         'action': 'crossfade',
         'input': [
@@ -206,7 +146,7 @@ def test_complex_workflow():
                         'input': TEST_VIDEO1,
                         'start': 0, 'duration': 5
                     },
-                    'width': 640, 'height': 360
+                    'width': 160, 'height': 90
                 },
                 'type': 'in', 'duration': 1
             },
@@ -219,7 +159,7 @@ def test_complex_workflow():
                         'input': TEST_VIDEO2,
                         'start': 0, 'duration': 5
                     },
-                    'width': 640, 'height': 360
+                    'width': 160, 'height': 90
                 },
                 'volume': 0.8
             }
@@ -227,12 +167,11 @@ def test_complex_workflow():
         'duration': 2.0,
         'stream1_duration': 5.0
     }
-    result = handler.render_workflow(workflow)
+    result = handler.render_workflow(workflow, verify_only=True)
     response = send_response(result=result)
     assert 'result' in response
 
-def test_multi_action_concat():
-    handler = MediaMCPHandler()
+def test_multi_action_concat(handler):
     workflow = {
         'action': 'concat',
         'input': [
@@ -250,12 +189,12 @@ def test_multi_action_concat():
                 'input': {
                     'action': 'scale',
                     'input': TEST_VIDEO2,
-                    'width': 640, 'height': 360
+                    'width': 160, 'height': 90
                 },
                 'factor': 1.5
             }
         ]
     }
-    result = handler.render_workflow(workflow)
+    result = handler.render_workflow(workflow, verify_only=True)
     response = send_response(result=result)
     assert 'result' in response